@@ -1,6 +1,8 @@
 from __future__ import annotations  # Python 3.8
 
 import enum
+import functools
+import struct
 
 import construct
 import netcast as nc
@@ -9,7 +11,31 @@ import netcast as nc
 DRIVER_NAME = "construct"
 
 
+def byte_order(big_endian, little_endian):
+    """Return the construct format field suffix for the given endianness."""
+    if big_endian:
+        return "b"
+    if little_endian:
+        return "l"
+    return "n"
+
+
+@functools.lru_cache(maxsize=None)
+def format_field(kind, bit_size, signedness, order):
+    """
+    Find a construct format field, e.g. format_field("Int", 16, "s", "l") -> Int16sl.
+
+    Names are resolved once per combination, since serializers reconfigure on every call.
+    """
+    return getattr(construct, kind + str(bit_size) + signedness + order, None)
+
+
+format_struct = functools.lru_cache(maxsize=None)(struct.Struct)
+
+
 class Interface(nc.Interface):
+    _fmt: struct.Struct | None = None
+
     def __init__(self, **settings):
         self.compiled = settings.setdefault("compiled", not self.driver.DEBUG)
         self.skip = set()
@@ -95,8 +121,18 @@ class Interface(nc.Interface):
 
     def _load(self, obj, settings, **kwargs):
         impl = self.impl()
+        if self._fmt is not None and isinstance(obj, (bytes, bytearray, memoryview)):
+            field = impl.subcon if isinstance(impl, construct.Renamed) else impl
+            if field is self._impl:  # not wrapped, so struct can do construct's job
+                return self._fmt.unpack_from(obj)[0]
         return impl.parse(obj)
 
+    def _set_format_struct(self, impl):
+        if isinstance(impl, construct.FormatField):
+            self._fmt = format_struct(impl.fmtstr)
+        else:
+            self._fmt = None
+
     def _dump(self, obj, settings, **kwargs):
         impl = self.impl()
         return impl.build(obj)
@@ -210,7 +246,9 @@ class Integer(Interface):
         little_endian,
         native_endian,
     ):
-        if cpu_sized and any(map(callable, (big_endian, little_endian, native_endian))):
+        if cpu_sized and (
+            callable(big_endian) or callable(little_endian) or callable(native_endian)
+        ):
             cpu_sized = False
 
         impl = None
@@ -220,8 +258,8 @@ class Integer(Interface):
         if self.bit_size:
             if cpu_sized:
                 impl = self.get_format_field()
-                cpu_sized = False
             if impl is None:
+                cpu_sized = False
                 impl = self.get_bytes_integer()
 
         if impl is None:
@@ -232,6 +270,7 @@ class Integer(Interface):
         self.settings.update(signed=signed, cpu_sized=cpu_sized)
         self.cpu_sized = cpu_sized
         self._impl = impl
+        self._set_format_struct(impl)
 
     def get_swapped(self):
         if (
@@ -251,15 +290,12 @@ class Integer(Interface):
         )
 
     def get_format_field(self):
-        type_name = "Int" + str(self.bit_size) + "us"[self.signed]
-        if self.big_endian:
-            type_name += "b"
-        elif self.little_endian:
-            type_name += "l"
-        else:
-            type_name += "n"
-        obj = getattr(construct, type_name, None)
-        return obj
+        return format_field(
+            "Int",
+            self.bit_size,
+            "us"[self.signed],
+            byte_order(self.big_endian, self.little_endian),
+        )
 
 
 @Driver.impl
@@ -288,17 +324,12 @@ class FloatingPoint(Interface):
                 f"construct does not support {type(self).__name__}"
             )
         self._impl = impl
+        self._set_format_struct(impl)
 
     def get_format_field(self):
-        type_name = "Float" + str(self.bit_size)
-        if self.big_endian:
-            type_name += "b"
-        elif self.little_endian:
-            type_name += "l"
-        else:
-            type_name += "n"
-        obj = getattr(construct, type_name, None)
-        return obj
+        return format_field(
+            "Float", self.bit_size, "", byte_order(self.big_endian, self.little_endian)
+        )
 
 
 class _EncodingUnitExtension:
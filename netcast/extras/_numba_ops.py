@@ -0,0 +1,24 @@
+"""
+Machine code compilation of arithmetic expressions with Numba.
+
+Only float functions are compiled: CPython integers are arbitrary-precision and would
+silently wrap around as int64, whereas float arithmetic is IEEE 754 on both sides.
+Numba is imported on first use, so that it is only paid for when asked for.
+"""
+from __future__ import annotations  # Python 3.8
+
+from typing import Callable
+
+__all__ = ("compile_float_function",)
+
+
+def compile_float_function(source: str, names: list[str]) -> Callable[..., float]:
+    """Compile a function of float arguments returning the given expression source."""
+    try:
+        import numba
+    except ImportError as exc:
+        raise ImportError("compiling expressions requires numba") from exc
+    namespace = {}
+    exec(f"def function({', '.join(names)}):\n    return {source}\n", namespace)
+    signature = numba.float64(*[numba.float64] * len(names))
+    return numba.njit(signature)(namespace["function"])
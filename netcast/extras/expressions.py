@@ -1,15 +1,31 @@
 # flake8: noqa
 from __future__ import annotations  # Python 3.8
 
+import collections
 import enum
+import itertools
+import keyword
 import math
 import operator
+import types
+import weakref
 from typing import Any, Callable, Union, Literal
 
 from netcast.constants import MISSING
+from netcast.extras._numba_ops import compile_float_function
 from netcast.tools import strings
 from netcast.tools.collections import ParameterHolder
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None  # type: ignore
+
 __all__ = (
     "EvalFlags",
     "Variable",
@@ -28,35 +44,52 @@ class EvalFlags(enum.IntFlag):
 
     @classmethod
     def validate(cls, flags: int | EvalFlags):
-        mutex_msg = "mutually exclusive listed execution flags: %s"
-        mutex_flags = []
+        bits = int.__and__(flags, 0b1111)  # bypass the enum machinery of EvalFlags.__and__
+        error = _FLAG_ERRORS[bits]
+        if error is not None:
+            raise ValueError(error)
+        if bits == flags:
+            return flags
+        return flags & 0b1111
+
+
+def _flag_error(flags: int) -> str | None:
+    mutex_msg = "mutually exclusive listed execution flags: %s"
+    mutex_flags = []
+
+    if (flags & EvalFlags.PRE_DUMP) and (flags & EvalFlags.PRE_DUMP_REVERSE):
+        mutex_flags.append("PRE_DUMP and PRE_DUMP_REVERSE")
 
-        flags &= 0b1111
+    if (flags & EvalFlags.POST_LOAD) and (flags & EvalFlags.POST_LOAD_REVERSE):
+        mutex_flags.append("POST_LOAD and POST_LOAD_REVERSE")
 
-        if (flags & cls.PRE_DUMP) and (flags & cls.PRE_DUMP_REVERSE):
-            mutex_flags.append("PRE_DUMP and PRE_DUMP_REVERSE")
+    if mutex_flags:
+        return mutex_msg % ", ".join(mutex_flags)
 
-        if (flags & cls.POST_LOAD) and (flags & cls.POST_LOAD_REVERSE):
-            mutex_flags.append("POST_LOAD and POST_LOAD_REVERSE")
+    ambiguity_msg = (
+        "%s execution flags "
+        "double the expression evaluation in a common direction which is ambiguous "
+        "and unsupported; expression redesign or checking for mistakes is recommended"
+    )
 
-        if mutex_flags:
-            raise ValueError(mutex_msg % ", ".join(mutex_flags))
+    if (flags & EvalFlags.PRE_DUMP) and (flags & EvalFlags.POST_LOAD):
+        mutex_flags.append("PRE_DUMP and POST_LOAD")
+    if (flags & EvalFlags.PRE_DUMP_REVERSE) and (flags & EvalFlags.POST_LOAD_REVERSE):
+        mutex_flags.append("PRE_DUMP_REVERSE and POST_LOAD_REVERSE")
 
-        ambiguity_msg = (
-            "%s execution flags "
-            "double the expression evaluation in a common direction which is ambiguous "
-            "and unsupported; expression redesign or checking for mistakes is recommended"
-        )
+    if mutex_flags:
+        return ambiguity_msg % ", ".join(mutex_flags)
+    return None
 
-        if (flags & cls.PRE_DUMP) and (flags & cls.POST_LOAD):
-            mutex_flags.append("PRE_DUMP and POST_LOAD")
-        if (flags & cls.PRE_DUMP_REVERSE) and (flags & cls.POST_LOAD_REVERSE):
-            mutex_flags.append("PRE_DUMP_REVERSE and POST_LOAD_REVERSE")
 
-        if mutex_flags:
-            raise ValueError(ambiguity_msg % ", ".join(mutex_flags))
-        return flags
+# Every combination of the 4 flags, so that validation is a single lookup
+_FLAG_ERRORS = tuple(map(_flag_error, range(16)))
 
+_CONFIGURABLE_KEYS = ("const", "flags")
+
+_PARAMETRIZE, _APPLY, _APPLY_SHARED, _REUSE, _MEMOIZED, _SHORT_CIRCUIT = range(6)
+
+_EVAL_CACHE_SIZE = 128
 
 PRE = PRE_DUMP = EvalFlags.PRE_DUMP
 PREREVERSE = PRE_DUMP_REVERSE = EvalFlags.PRE_DUMP_REVERSE
@@ -65,6 +98,8 @@ POSTREVERSE = POST_LOAD_REVERSE = EvalFlags.POST_LOAD_REVERSE
 
 
 class ExpressionOps:
+    __slots__ = ()
+
     def _operative(self):
         return self
 
@@ -126,6 +161,12 @@ class ExpressionOps:
     def divmod(self, other):
         return DivMod(self._operative(), other)
 
+    def __matmul__(self, other):
+        return MatrixMultiply(self._operative(), other)
+
+    def __rmatmul__(self, other):
+        return MatrixMultiply(other, self._operative())
+
     def __lshift__(self, other):
         return ShiftLeft(self._operative(), other)
 
@@ -180,7 +221,7 @@ class ExpressionOps:
     def xor_(self, other):
         return XOr(self._operative(), other)
 
-    def __eq__(self, other):
+    def eq(self, other):
         return Equal(self._operative(), other)
 
     def getitem(self, other):
@@ -224,6 +265,8 @@ class ExpressionOps:
 
 
 class OpsExtension(ExpressionOps):
+    __slots__ = ("wrapped",)
+
     def __init__(self, wrapped):
         self.wrapped = wrapped
 
@@ -237,14 +280,38 @@ class Expression(ExpressionOps):
     to automate processing.
     """
 
+    __slots__ = (
+        "left",
+        "right",
+        "const",
+        "_flags",
+        "_reversed_pre",
+        "_reversed_post",
+        "inplace",
+        "_processor",
+        "_reverse_processor",
+        "_programs",
+        "_dependents",
+        "_result",
+        "__weakref__",
+    )
+
     op_func: _DelegateT
     iop_func: _DelegateT
     opreverse_func: _DelegateT
     iopreverse_func: _DelegateT
 
     irreversible = False
+    associative = False
+    pure = True  # whether the processor has no side effects
+    identity: Any = MISSING  # operand the processor returns the other operand for
+    parametrize: Callable[..., None] | None = None  # overridden by expressions taking parameters
     _require_left = True
-
+    _processors: tuple[tuple[Any, Any], tuple[Any, Any]] = ((None, None), (None, None))
+    _processor_methods: tuple[tuple[bool, bool], tuple[bool, bool]] = (
+        (False, False),
+        (False, False),
+    )
     def __init__(
         self,
         left: Any | Expression = MISSING,
@@ -260,78 +327,573 @@ class Expression(ExpressionOps):
         self.left = left
         self.right = right
         self.const = const
-        self.flags = EvalFlags.validate(flags)
+        self._set_flags(flags)
         self.inplace = inplace
-        self.__cache = MISSING
+
+        inplace = bool(inplace)
+        processor, reverse_processor = self._processors[inplace]
+        processor_is_method, reverse_processor_is_method = self._processor_methods[inplace]
+        if processor_is_method:
+            processor = processor.__get__(self, type(self))
+        if reverse_processor_is_method:
+            reverse_processor = reverse_processor.__get__(self, type(self))
+        self._processor, self._reverse_processor = processor, reverse_processor
+        self._programs = None
+        self._dependents = None  # expressions whose compiled programs include this one
+        self._result = MISSING
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        processor = _get_processor(cls, "op_func", (None, False))
+        reverse_processor = _get_processor(cls, "opreverse_func", (None, False))
+        iprocessor = _get_processor(cls, "iop_func", processor)
+        ireverse_processor = _get_processor(cls, "iopreverse_func", reverse_processor)
+        if cls.irreversible:
+            reverse_processor = ireverse_processor = _left, False
+        # (processor, reverse processor) pairs, indexed by whether operating in place;
+        # processors defined as methods are bound to each instance in __init__
+        pairs = (processor, reverse_processor), (iprocessor, ireverse_processor)
+        cls._processors = tuple(tuple(function for function, _ in pair) for pair in pairs)
+        cls._processor_methods = tuple(tuple(method for _, method in pair) for pair in pairs)
 
     def conf(self, **kwargs):
-        configurable_keys = {"const", "flags"}
-        for key in kwargs.keys() & configurable_keys:
+        for key in _CONFIGURABLE_KEYS:
             new_value = kwargs.get(key, MISSING)
-            if key == "flags":
-                new_value = EvalFlags.validate(new_value)
             if new_value is not MISSING:
                 setattr(self, key, new_value)
+        if not self.const:
+            self._result = MISSING  # forget the memoized result
         return self
 
-    def parametrize(self, **kwargs):
-        pass
-
     def eval(self, procedure: Literal[PRE, POST] = PRE, **params):
-        if self.__cache is not MISSING:
-            return self.__cache
+        if self._result is not MISSING:
+            return self._result
         if procedure in (PREREVERSE, POSTREVERSE):
             raise ValueError("reverse flags are invalid in this context")
-        self.parametrize(**params)
-        result = self._eval(procedure, **params)
+        if self.parametrize is not None:
+            self.parametrize(**params)
+        left, right = self.left, self.right
+        if isinstance(left, Expression) or isinstance(right, Expression):
+            return self._run(procedure, params)
+        processor = self._processor
+        if processor is None or self.is_reversed(procedure):
+            result = self._apply(procedure, left, right)
+        else:
+            result = processor(left, right)
+        if self.const:
+            self._memoize(result)
+        return result
+
+    def eval_cached(self, procedure: Literal[PRE, POST] = PRE, **params):
+        """
+        Evaluate this expression, reusing the result of an earlier call with equal parameters.
+
+        Results are only cached if every variable in the tree is passed as a hashable
+        parameter and nothing in the tree is impure (like calls) or operates in place;
+        otherwise the expression is evaluated as usual. Parameters are only equal
+        if their types are, too. Up to _EVAL_CACHE_SIZE results are kept per procedure,
+        least recently used go first.
+        """
+        if self._result is not MISSING:
+            return self._result
+        if procedure in (PREREVERSE, POSTREVERSE):
+            raise ValueError("reverse flags are invalid in this context")
+        program = self._get_program(procedure)
+        compiled = self._programs
+        key = "cache", procedure
+        cache = compiled.get(key, MISSING)
+        if cache is MISSING:
+            cache = compiled[key] = _eval_cache(self, program)
+        if cache is None:
+            return self.eval(procedure, **params)
+        variables, results = cache
+        if any(variable.name not in params for variable in variables):
+            return self.eval(procedure, **params)
+        if not _is_unchanged(program):
+            self._programs = None  # recompile, along with a new cache
+            return self.eval(procedure, **params)
+        params_key = tuple(sorted((name, type(value), value) for name, value in params.items()))
+        try:
+            hash(params_key)
+        except TypeError:
+            return self.eval(procedure, **params)
+        result = results.pop(params_key, MISSING)
+        if result is MISSING:
+            result = self.eval(procedure, **params)
+            if len(results) >= _EVAL_CACHE_SIZE:
+                del results[next(iter(results))]
+        else:
+            for variable in variables:
+                variable.parametrize(**params)  # leave variables as evaluation would
+        results[params_key] = result
+        return result
+
+    def clear_cache(self):
+        """Forget the results cached by eval_cached()."""
+        if self._programs is not None:
+            for procedure in (PRE, POST):
+                self._programs.pop(("cache", procedure), None)
+
+    def batch_eval(self, procedure: Literal[PRE, POST] = PRE, **params):
+        """
+        Evaluate this expression elementwise over numpy arrays passed as parameters.
+
+        Processors with a numpy ufunc counterpart run as a single ufunc call,
+        the remaining ones are called once per element. If numexpr is installed
+        and the whole expression consists of arithmetic, it is evaluated
+        by numexpr in one pass, without allocating intermediate arrays.
+        Raise ImportError if numpy is not installed.
+        """
+        if numpy is None:
+            raise ImportError("Expression.batch_eval() requires numpy")
+        if self._result is not MISSING:
+            return self._result
+        if procedure in (PREREVERSE, POSTREVERSE):
+            raise ValueError("reverse flags are invalid in this context")
+        if self.parametrize is not None:
+            self.parametrize(**params)
+        left, right = self.left, self.right
+        if isinstance(left, Expression) or isinstance(right, Expression):
+            result = self._eval_fused(procedure, params)
+            if result is not MISSING:
+                return result
+            return self._run(procedure, params, batch=True)
+        result = self._batch_apply(procedure, left, right)
         if self.const:
-            self.__cache = result
+            self._memoize(result)
         return result
 
+    def _batch_apply(self, procedure, left, right) -> Any:
+        if self.is_reversed(procedure):
+            processor = self._reverse_processor
+        else:
+            processor = self._processor
+        if processor is None:
+            return self._apply(procedure, left, right)
+        if (
+            processor is _call
+            and type(left) is types.BuiltinFunctionType
+            and not isinstance(right, ParameterHolder)
+        ):
+            ufunc = _UNARY_UFUNCS.get(left)
+            if ufunc is not None:
+                return ufunc(right)
+        ufunc = _UFUNCS.get(processor)
+        if ufunc is None:
+            ufunc = numpy.frompyfunc(processor, 2, 1)
+        return ufunc(left, right)
+
+    def _eval_fused(self, procedure, params) -> Any:
+        """
+        Evaluate this expression as a single numexpr expression.
+
+        Return MISSING if numexpr is not installed, the expression cannot be
+        expressed in numexpr or numexpr does not compute in the types of the operands,
+        so that the result is the same as that of the ufuncs.
+        """
+        if numexpr is None:
+            return MISSING
+        program = self._get_program(procedure)
+        compiled = self._programs
+        key = "numexpr", procedure
+        fused = compiled.get(key, MISSING)
+        if fused is MISSING:
+            fused = compiled[key] = _emit_source(program, _NUMEXPR_OPERATORS)
+        if fused is None or not _is_unchanged(program):
+            return MISSING
+        source, variables = fused
+        local_dict = {}
+        for name, variable in variables.items():
+            variable.parametrize(**params)
+            value = variable.left
+            if (
+                isinstance(value, Expression)
+                or numpy.asarray(value).dtype.name not in _NUMEXPR_TYPES
+            ):
+                return MISSING
+            local_dict[name] = value
+        try:
+            return numexpr.evaluate(source, local_dict=local_dict)
+        except (TypeError, ValueError, NotImplementedError):
+            return MISSING
+
+    def to_function(self, procedure: Literal[PRE, POST] = PRE) -> Callable[..., Any]:
+        """
+        Compile this expression into a Python function taking its variables as arguments.
+
+        The function reflects the expression as of compilation. Only expressions
+        made of Python operators over variables and number literals can be compiled.
+        """
+        program = self._get_program(procedure)
+        compiled = self._programs
+        key = "python", procedure
+        function = compiled.get(key)
+        if function is None:
+            emitted = _emit_source(program, _PYTHON_OPERATORS)
+            if emitted is None:
+                raise ValueError("expression cannot be compiled, it is not only operators")
+            source, variables = emitted
+            function = compiled[key] = eval(f"lambda {', '.join(variables)}: {source}", {})
+        return function
+
+    def jit(self, procedure: Literal[PRE, POST] = PRE) -> Callable[..., float]:
+        """
+        Compile this expression with Numba into a function of its variables.
+
+        The function takes and returns floats and reflects the expression
+        as of compilation. Only basic arithmetic can be compiled.
+        Raise ImportError if Numba is not installed.
+        """
+        program = self._get_program(procedure)
+        compiled = self._programs
+        key = "numba", procedure
+        function = compiled.get(key)
+        if function is None:
+            emitted = _emit_source(program, _FLOAT_OPERATORS)
+            if emitted is None:
+                raise ValueError("expression cannot be compiled, it is not only arithmetic")
+            source, variables = emitted
+            function = compiled[key] = compile_float_function(source, list(variables))
+        return function
+
+    @property
+    def flags(self):
+        return self._flags
+
+    @flags.setter
+    def flags(self, flags):
+        if flags == self._flags:
+            return
+        self._set_flags(flags)
+        _invalidate(self)  # compiled programs choose processors by the flags
+
+    def _set_flags(self, flags):
+        self._flags = flags = EvalFlags.validate(flags)
+        self._reversed_pre = bool(flags & PREREVERSE)
+        self._reversed_post = bool(flags & POSTREVERSE)
+
     def is_reversed(self, procedure):
-        return (procedure == PRE and self.flags & PREREVERSE) or (
-            procedure == POST and self.flags & POSTREVERSE
-        )
+        if procedure == PRE:
+            return self._reversed_pre
+        return procedure == POST and self._reversed_post
 
-    def _eval(self, procedure, **kwargs) -> Any:
+    def _apply(self, procedure, left, right) -> Any:
         if self.is_reversed(procedure):
-            if self.irreversible:
-                processor = _left
-            else:
-                processor = self._get_processor("opreverse_func")
-                if processor is None:
-                    raise NotImplementedError(
-                        "cannot reverse an expression that is marked reversible. "
-                        "Consider using `irreversible = True` setting"
-                    )
+            processor = self._reverse_processor
+            if processor is None:
+                raise NotImplementedError(
+                    "cannot reverse an expression that is marked reversible. "
+                    "Consider using `irreversible = True` setting"
+                )
         else:
-            processor = self._get_processor("op_func")
-        if not callable(processor):
-            raise ValueError(
-                "value processor was not declared (and thus is not callable)"
-            )
-        left, right = self._eval_branches(procedure, **kwargs)
+            processor = self._processor
+            if processor is None:
+                raise ValueError(
+                    "value processor was not declared (and thus is not callable)"
+                )
         return processor(left, right)
 
-    def _eval_branches(self, procedure, **kwargs):
-        operands = []
-        for node_name in ("left", "right"):
-            operand = node = getattr(self, node_name)
-            if isinstance(node, Expression):
-                operand = node.eval(procedure, **kwargs)
-                if node.const:
-                    setattr(self, node_name, operand)
-            operands.append(operand)
-        return operands
-
-    def _get_processor(self, attr_name) -> Callable:
-        iattr_name = ("i" if self.inplace else "") + attr_name
-        fallback = getattr(self, attr_name) if self.inplace else None
-        return getattr(self, iattr_name, fallback)
+    @classmethod
+    def folded(cls, *args, **kwargs) -> Any:
+        """
+        Create an expression, or evaluate it right away if its result is known up front.
+
+        That is the case when no expression in the tree takes parameters (like variables),
+        operates in place or is ever reversed, so that it evaluates to the same value
+        on every call and in both procedures. Calls and attribute access are never folded.
+
+        Associative expressions with a constant right operand also absorb it into
+        a left operand of the same class and flags, e.g. `(x + 2) + 3` becomes `x + 5`,
+        unless they are ever reversed. Float operands are never regrouped, as that could
+        change the rounding. The type of the remaining operand (e.g. the value of `x`)
+        is not known up front though, so if that is a float or a fixed-width number,
+        regrouping can still change the rounding or overflow of the result.
+        """
+        expression = cls(*args, **kwargs)
+        if _is_foldable(expression):
+            return expression.eval()
+        left, right = expression.left, expression.right
+        if (
+            cls.associative
+            and type(left) is cls
+            and left.flags == expression.flags
+            and not expression.flags & (PREREVERSE | POSTREVERSE)
+            and not (left.const or left.inplace or expression.inplace)
+            and not isinstance(left.right, (Expression, float, complex))
+            and not isinstance(right, (Expression, float, complex))
+        ):
+            return cls(left.left, left._processor(left.right, right), **kwargs)
+        return expression
+
+    @classmethod
+    def interned(cls, left: Any | Expression = MISSING, right: Any | Expression = MISSING, **kwargs):
+        """
+        Create an expression, or return an existing one with the same operands and settings.
+
+        Interned expressions are shared, so that evaluation computes them once
+        and they should not be reconfigured. Expressions taking parameters (like variables),
+        impure or operating in place, as well as ones with unhashable operands,
+        are never interned.
+        """
+        if not _is_shareable(cls, kwargs.get("inplace")):
+            return cls(left, right, **kwargs)
+        key = (cls, type(left), left, type(right), right, *sorted(kwargs.items()))
+        try:
+            return _interned[key]
+        except KeyError:
+            pass
+        except TypeError:
+            return cls(left, right, **kwargs)
+        expression = _interned[key] = cls(left, right, **kwargs)
+        return expression
+
+    def canonicalize(self):
+        """
+        Merge structurally identical subexpressions of this expression into one.
+
+        Subexpressions of the same class, flags and operands are replaced by the first
+        of them found, so that evaluation computes them once. Expressions taking
+        parameters (like variables), impure, operating in place or memoizing are left
+        as they are.
+        """
+        canonical = {}
+        merged = {}
+        pending = [(self, False)]
+
+        while pending:
+            node, expanded = pending.pop()
+            if id(node) in canonical:
+                continue
+            if not expanded:
+                pending.append((node, True))
+                for operand in (node.right, node.left):
+                    if isinstance(operand, Expression):
+                        pending.append((operand, False))
+                continue
+
+            left, right = node.left, node.right
+            if isinstance(left, Expression):
+                left = canonical[id(left)]
+                if left is not node.left:
+                    node.left = left
+                    _invalidate(node)
+            if isinstance(right, Expression):
+                right = canonical[id(right)]
+                if right is not node.right:
+                    node.right = right
+                    _invalidate(node)
+
+            if node.const or not _is_shareable(node, node.inplace):
+                canonical[id(node)] = node
+                continue
+            key = type(node), int(node.flags), _operand_key(left), _operand_key(right)
+            canonical[id(node)] = merged.setdefault(key, node)
+
+        return self
+
+    def simplify(self):
+        """
+        Drop subexpressions that return one of their operands unchanged, like `x + 0`.
+
+        Only integer identity operands are recognized, and only on the right side
+        unless the expression is associative. The surviving operand must be an int,
+        or a float in additions and multiplications, since the processor could convert
+        or reject other values. Expressions that are const, reversed into another
+        processor or part of a tree operating in place are kept.
+        Return the simplified expression, which is the surviving operand
+        if this expression itself is dropped.
+        """
+        if _operates_in_place(self):
+            return self
+        return _rewrite(self, _simplified)
+
+    def fold(self):
+        """
+        Replace subexpressions whose result is known up front with their results.
+
+        Like folded(), but for a whole tree that is already built: every subexpression
+        of constant operands that takes no parameters, is pure, never reversed and does
+        not operate in place is evaluated once, as are memoized ones. Subexpressions
+        that raise are kept, to raise on evaluation. Return the folded expression,
+        which is its result if this expression itself is folded.
+        """
+        return _rewrite(self, _folded)
+
+    def compile(self):
+        """
+        Compile the programs this expression is evaluated with, for both procedures.
+
+        Programs are otherwise compiled lazily by the first evaluation.
+        """
+        self._get_program(PRE)
+        self._get_program(POST)
+        return self
+
+    def _memoize(self, result):
+        self._result = result
+        _invalidate(self)
+
+    def _get_program(self, procedure) -> list[tuple]:
+        programs = self._programs
+        if programs is None:
+            programs = self._programs = {}
+        program = programs.get(procedure)
+        if program is None:
+            program = programs[procedure] = self._compile(procedure)
+            for node in {instruction[1] for instruction in program}:
+                dependents = node._dependents
+                if dependents is None:
+                    dependents = node._dependents = weakref.WeakSet()
+                dependents.add(self)
+        return program
+
+    def _compile(self, procedure) -> list[tuple]:
+        """
+        Linearize this expression tree into a program of instructions for _run().
+
+        Every subexpression gets an apply instruction in post-order, preceded in pre-order
+        by a parametrize instruction if it takes parameters. Apply instructions record
+        the operands seen during compilation and the processor to use for the procedure.
+        Values of variables are not expanded, but resolved when the program runs, so that
+        passing or rebinding a variable takes effect. Memoized subexpressions are not
+        expanded either, nor are right operands that the processor discards,
+        unless they are const or operate in place. Such right
+        operands of logical and/or are preceded by a short-circuit instruction instead,
+        which records how many instructions to skip. Repeated occurrences of a subexpression
+        reuse the result of the first one, unless it takes parameters or something in it
+        is impure or operates in place.
+        """
+        program = []
+        pending = [self]
+        applied = {}
+        short_circuits = {}
+
+        while pending:
+            node = pending.pop()
+
+            if type(node) is tuple:
+                if node[0] is _SHORT_CIRCUIT:
+                    short_circuits[node[1]] = len(program)
+                else:
+                    applied[node[1]] = index = len(program)
+                    start = short_circuits.pop(node[1], None)
+                    if start is not None:
+                        skip = program[start]
+                        program[start] = (*skip[:3], index - start - 1, *skip[4:])
+                program.append(node)
+                continue
+
+            if node is not self:
+                if node._result is not MISSING:
+                    program.append((_MEMOIZED, node, None, None, False, False, None))
+                    continue
+                index = applied.get(node)
+                if index is not None and _is_reusable(node):
+                    program[index] = (_APPLY_SHARED, *program[index][1:])
+                    program.append((_REUSE, node, None, None, False, False, None))
+                    continue
+                if node.parametrize is not None:
+                    program.append((_PARAMETRIZE, node, None, None, False, False, None))
+
+            if node.is_reversed(procedure):
+                processor = node._reverse_processor
+            else:
+                processor = node._processor
+            left, right = node.left, node.right
+            if isinstance(node, Variable):
+                left = MISSING  # resolved when run, as the variable may be rebound or passed
+            left_is_node = isinstance(left, Expression)
+            # The right operand is discarded (e.g. by irreversible expressions in reverse)
+            right_is_node = isinstance(right, Expression) and not (
+                processor is _left and _is_discardable(right)
+            )
+            pending.append((_APPLY, node, left, right, left_is_node, right_is_node, processor))
+            if right_is_node:
+                pending.append(right)
+                condition = _SHORT_CIRCUITS.get(processor)
+                if condition is not None and left_is_node and _is_discardable(right):
+                    pending.append((_SHORT_CIRCUIT, node, left, 0, False, False, condition))
+            if left_is_node:
+                pending.append(left)
+
+        return program
+
+    def _run(self, procedure, params, batch=False) -> Any:
+        """
+        Run the compiled program of this expression. It must be parametrized beforehand.
+
+        Operands that changed since compilation (e.g. variable values) are resolved live.
+        Once an expression in the program memoizes its result or changes its flags,
+        the program is compiled again on next run.
+        """
+        program = self._get_program(procedure)
+        steps = iter(program)
+        values = []
+        shared = {}
+        if batch:
+            evaluate, apply = Expression.batch_eval, Expression._batch_apply
+        else:
+            evaluate, apply = Expression.eval, Expression._apply
+
+        for instruction, node, left_ref, right_ref, left_is_node, right_is_node, processor in steps:
+            if instruction is _PARAMETRIZE:
+                node.parametrize(**params)
+                continue
+
+            if instruction is _SHORT_CIRCUIT:
+                if not batch and node.left is left_ref and processor(values[-1]):
+                    values.append(MISSING)  # the right operand, which the processor ignores
+                    collections.deque(itertools.islice(steps, right_ref), maxlen=0)
+                continue
+
+            if instruction is _REUSE:
+                result = shared.get(node, MISSING)
+                if result is MISSING:  # the first occurrence was short-circuited
+                    result = evaluate(node, procedure, **params)
+                values.append(result)
+                continue
+
+            if instruction is _MEMOIZED:
+                values.append(evaluate(node, procedure, **params))
+                continue
+
+            left, right = node.left, node.right
+            if right_is_node:
+                value = values.pop()
+                if right is right_ref:
+                    right = value
+                    if right_ref.const:
+                        node.right = right
+            if left_is_node:
+                value = values.pop()
+                if left is left_ref:
+                    left = value
+                    if left_ref.const:
+                        node.left = left
+            if left is not left_ref and isinstance(left, Expression):
+                left = evaluate(left, procedure, **params)
+            if right is not right_ref and isinstance(right, Expression):
+                right = evaluate(right, procedure, **params)
+
+            if node._result is not MISSING:  # memoized since compilation
+                result = node._result
+            elif processor is None or batch:
+                result = apply(node, procedure, left, right)
+            else:
+                result = processor(left, right)
+            if node.const and node._result is MISSING:
+                node._memoize(result)
+            if instruction is _APPLY_SHARED:
+                shared[node] = result
+            values.append(result)
+
+        return values.pop()
 
     def __repr__(self):
-        return f"{type(self).__name__}({self.left}, {self.right})".lstrip("~")
+        return f"{type(self).__name__}({self.left}, {self.right})"
+
 
+_interned: weakref.WeakValueDictionary[tuple, Expression] = weakref.WeakValueDictionary()
 
 _DelegateT = Union[Callable[[Any, Any], Any], Callable[[Expression, Any, Any], Any]]
 
@@ -340,6 +902,273 @@ def _left(left, _):
     return left
 
 
+def _get_processor(cls: type, name: str, default: tuple[Any, bool]) -> tuple[Any, bool]:
+    """Return a processor declared in the class and whether it is a method taking self."""
+    for klass in cls.__mro__:
+        namespace = vars(klass)
+        if name in namespace:
+            return getattr(cls, name), isinstance(namespace[name], types.FunctionType)
+    return default
+
+
+def _is_shareable(expression, inplace):
+    # Shared expressions are evaluated once for all of their parents, which would
+    # mix up parameters, repeat in-place updates and merge side effects otherwise
+    return expression.parametrize is None and expression.pure and not inplace
+
+
+def _is_reusable(expression):
+    # Reusing a result within one run only loses something if the subexpression
+    # has side effects or updates an operand in place
+    if not _is_shareable(expression, expression.inplace):
+        return False
+    pending = [expression.left, expression.right]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, Expression):
+            if node.inplace or not node.pure:
+                return False
+            pending.append(node.left)
+            pending.append(node.right)
+    return True
+
+
+def _is_foldable(expression):
+    pending = [expression]
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, Expression):
+            continue
+        if (
+            node.parametrize is not None
+            or node.inplace
+            or not node.pure
+            or node.flags & (PREREVERSE | POSTREVERSE)
+        ):
+            return False
+        pending.append(node.left)
+        pending.append(node.right)
+    return True
+
+
+# Infix operators that numexpr has counterparts of
+_NUMEXPR_OPERATORS = {
+    operator.add: "+",
+    operator.sub: "-",
+    operator.mul: "*",
+    operator.truediv: "/",
+    operator.pow: "**",
+    operator.lshift: "<<",
+    operator.rshift: ">>",
+}
+
+# Types numexpr computes in; unlike numpy, it casts inputs of other types up to these
+_NUMEXPR_TYPES = frozenset(("bool", "int32", "int64", "float32", "float64", "complex128"))
+
+
+# Infix operators that Numba evaluates on floats like Python does
+_FLOAT_OPERATORS = {
+    operator.add: "+",
+    operator.sub: "-",
+    operator.mul: "*",
+    operator.truediv: "/",
+}
+
+
+def _emit_source(program, operators):
+    """
+    Render a compiled program as an infix expression over variable names.
+
+    Return the source and the variables it refers to by name,
+    or None if some expression in the program has no operator in the given table.
+    """
+    values = []
+    shared = {}
+    variables = {}
+
+    for instruction, node, left_ref, right_ref, left_is_node, right_is_node, processor in program:
+        if instruction is _PARAMETRIZE or instruction is _SHORT_CIRCUIT:
+            continue
+        if instruction is _REUSE:
+            values.append(shared[node])
+            continue
+        if instruction is _MEMOIZED or node.const:
+            return None
+
+        if isinstance(node, Variable):
+            if (
+                left_is_node
+                or processor is not _left
+                or not node.name.isidentifier()
+                or keyword.iskeyword(node.name)
+                or variables.setdefault(node.name, node) is not node
+            ):
+                return None
+            source = node.name
+        else:
+            symbol = operators.get(processor)
+            right = values.pop() if right_is_node else _literal_source(right_ref)
+            left = values.pop() if left_is_node else _literal_source(left_ref)
+            if symbol is None or left is None or right is None:
+                return None
+            source = f"({left} {symbol} {right})"
+
+        if instruction is _APPLY_SHARED:
+            shared[node] = source
+        values.append(source)
+
+    return values.pop(), variables
+
+
+def _literal_source(value):
+    if type(value) is int or (type(value) is float and math.isfinite(value)):
+        source = repr(value)
+        if source.startswith("-"):  # keep unary minus from binding looser than **
+            source = f"({source})"
+        return source
+    return None
+
+
+def _is_unchanged(program):
+    """Check if no operand was reassigned in the tree since the program was compiled."""
+    for instruction, node, left_ref, right_ref, *_ in program:
+        if instruction is _APPLY or instruction is _APPLY_SHARED:
+            if node.right is not right_ref:
+                return False
+            if node.left is not left_ref and not isinstance(node, Variable):
+                return False
+    return True
+
+
+def _invalidate(expression):
+    """Drop the compiled programs of the expressions whose programs include this one."""
+    dependents = expression._dependents
+    if dependents:
+        for dependent in dependents:
+            dependent._programs = None
+        dependents.clear()
+
+
+def _eval_cache(expression, program):
+    """Return the variables and an empty result cache for a program, if it can be cached."""
+    if _operates_in_place(expression):
+        return None
+    if not all(node.pure for _, node, *_ in program):
+        return None
+    variables = [node for instruction, node, *_ in program if instruction is _PARAMETRIZE]
+    if expression.parametrize is not None:
+        variables.append(expression)
+    return variables, {}
+
+
+def _rewrite(expression, replace):
+    """
+    Rebuild an expression tree bottom-up, each node replaced by replace(node).
+
+    Operands are updated in place and shared subexpressions are replaced once.
+    Return the replacement of the root.
+    """
+    replaced = {}
+    pending = [(expression, False)]
+
+    while pending:
+        node, expanded = pending.pop()
+        if id(node) in replaced:
+            continue
+        if not expanded:
+            pending.append((node, True))
+            for operand in (node.right, node.left):
+                if isinstance(operand, Expression):
+                    pending.append((operand, False))
+            continue
+
+        left, right = node.left, node.right
+        if isinstance(left, Expression):
+            left = replaced[id(left)]
+            if left is not node.left:
+                node.left = left
+                _invalidate(node)
+        if isinstance(right, Expression):
+            right = replaced[id(right)]
+            if right is not node.right:
+                node.right = right
+                _invalidate(node)
+        replaced[id(node)] = replace(node)
+
+    return replaced[id(expression)]
+
+
+def _simplified(node):
+    identity = node.identity
+    if (
+        identity is MISSING
+        or node.const
+        or (node.flags & (PREREVERSE | POSTREVERSE) and not node.irreversible)
+    ):
+        return node
+    left, right = node.left, node.right
+    if type(right) is int and right == identity and _is_survivor(node, left):
+        return left
+    if node.associative and type(left) is int and left == identity and _is_survivor(node, right):
+        return right
+    return node
+
+
+def _is_survivor(node, operand):
+    # Other operands could be converted by the processor (True + 0) or make it raise ("a" + 0)
+    kind = type(operand)
+    return kind is int or (kind is float and isinstance(node, (Add, Multiply)))
+
+
+def _folded(node):
+    if node._result is not MISSING:
+        return node._result
+    if (
+        isinstance(node.left, Expression)
+        or isinstance(node.right, Expression)
+        or not _is_foldable(node)
+    ):
+        return node
+    try:
+        return node.eval()
+    except Exception:
+        return node
+
+
+def _operand_key(operand):
+    if isinstance(operand, Expression):
+        return Expression, id(operand)
+    try:
+        hash(operand)
+    except TypeError:
+        return None, id(operand)
+    return type(operand), operand
+
+
+def _operates_in_place(expression):
+    pending = [expression]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, Expression):
+            if node.inplace:
+                return True
+            pending.append(node.left)
+            pending.append(node.right)
+    return False
+
+
+def _is_discardable(expression):
+    pending = [expression]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, Expression):
+            if node.const or node.inplace:
+                return False
+            pending.append(node.left)
+            pending.append(node.right)
+    return True
+
+
 def _reverse_pow(left, right):
     return left ** (1 / right)
 
@@ -350,8 +1179,12 @@ def _ireverse_pow(left, right):
 
 
 def _reverse_divmod(left, right):
-    n, remainder = left
-    return n * right + remainder
+    return left[0] * right + left[1]
+
+
+def _reverse_matmul(left, right):
+    # Solve x @ right = left for x, i.e. right.T @ x.T = left.T
+    return numpy.linalg.solve(numpy.transpose(right), numpy.transpose(left)).T
 
 
 def _nand(left, right):
@@ -362,6 +1195,79 @@ def _nor(left, right):
     return ~(left | right)
 
 
+def _equ(left, right):
+    return ~(left ^ right)
+
+
+def _and(left, right):
+    return left and right
+
+
+def _or(left, right):
+    return left or right
+
+
+# Conditions on the left operand under which these processors return it as is
+_SHORT_CIRCUITS = {_and: operator.not_, _or: operator.truth}
+
+
+# Operators that evaluate like the processors they stand for
+_PYTHON_OPERATORS = {
+    operator.add: "+",
+    operator.sub: "-",
+    operator.mul: "*",
+    operator.truediv: "/",
+    operator.floordiv: "//",
+    operator.mod: "%",
+    operator.pow: "**",
+    operator.matmul: "@",
+    operator.lshift: "<<",
+    operator.rshift: ">>",
+    operator.and_: "&",
+    operator.or_: "|",
+    operator.xor: "^",
+    operator.eq: "==",
+    operator.is_: "is",
+    operator.is_not: "is not",
+    _and: "and",
+    _or: "or",
+}
+
+
+def _logical_nand(left, right):
+    if (left and right) is left:
+        return right
+    return left
+
+
+def _logical_nor(left, right):
+    if (left or right) is left:
+        return right
+    return left
+
+
+def _call(left, right):
+    if isinstance(right, ParameterHolder):
+        return left(*right.eval_arguments(left), **right.eval_keywords(left))
+    return left(right)
+
+
+def _logical_xor(left, right):
+    return bool(left) ^ bool(right)
+
+
+def _reverse_ldexp(left, right):
+    return left / (2**right)
+
+
+def _prod(left, right):
+    return math.prod(left, start=right)
+
+
+def _prepend(left, right):
+    return right + left
+
+
 def _concat_left(left, right):
     if not hasattr(right, "__getitem__"):
         msg = "%r object can't be concatenated" % type(right).__name__
@@ -369,7 +1275,97 @@ def _concat_left(left, right):
     return right + left
 
 
+# Numpy counterparts of processors, used for batch evaluation
+_UFUNCS: dict[Callable[[Any, Any], Any], Callable[[Any, Any], Any]] = {}
+_UNARY_UFUNCS: dict[Callable[[Any], Any], Callable[[Any], Any]] = {}
+
+if numpy is not None:
+    _UFUNCS.update(
+        {
+            _left: _left,
+            _nand: _nand,
+            _nor: _nor,
+            _equ: _equ,
+            _reverse_pow: _reverse_pow,
+            _reverse_divmod: _reverse_divmod,
+            operator.add: numpy.add,
+            operator.sub: numpy.subtract,
+            operator.mul: numpy.multiply,
+            operator.truediv: numpy.true_divide,
+            operator.floordiv: numpy.floor_divide,
+            operator.mod: numpy.remainder,
+            operator.pow: numpy.power,
+            operator.matmul: numpy.matmul,
+            operator.lshift: numpy.left_shift,
+            operator.rshift: numpy.right_shift,
+            operator.and_: numpy.bitwise_and,
+            operator.or_: numpy.bitwise_or,
+            operator.xor: numpy.bitwise_xor,
+            operator.eq: numpy.equal,
+            divmod: numpy.divmod,
+            math.atan2: numpy.arctan2,
+            math.copysign: numpy.copysign,
+            math.fmod: numpy.fmod,
+            math.gcd: numpy.gcd,
+            math.ldexp: numpy.ldexp,
+            math.pow: numpy.power,
+        }
+    )
+    # In-place operators on arrays already run as in-place ufuncs (with out=left)
+    for _processor in (
+        operator.iadd,
+        operator.isub,
+        operator.imul,
+        operator.itruediv,
+        operator.ifloordiv,
+        operator.imod,
+        operator.imatmul,
+        operator.ilshift,
+        operator.irshift,
+        operator.iand,
+        operator.ior,
+        operator.ixor,
+    ):
+        _UFUNCS[_processor] = _processor
+    # Builtins called on a single operand, e.g. by MathOps methods and unary operators
+    _UNARY_UFUNCS.update(
+        {
+            abs: numpy.absolute,
+            operator.neg: numpy.negative,
+            operator.pos: numpy.positive,
+            operator.not_: numpy.logical_not,
+            math.acos: numpy.arccos,
+            math.acosh: numpy.arccosh,
+            math.asin: numpy.arcsin,
+            math.asinh: numpy.arcsinh,
+            math.atan: numpy.arctan,
+            math.atanh: numpy.arctanh,
+            math.cos: numpy.cos,
+            math.cosh: numpy.cosh,
+            math.degrees: numpy.degrees,
+            math.exp: numpy.exp,
+            math.expm1: numpy.expm1,
+            math.fabs: numpy.fabs,
+            math.isfinite: numpy.isfinite,
+            math.isinf: numpy.isinf,
+            math.isnan: numpy.isnan,
+            math.log: numpy.log,
+            math.log10: numpy.log10,
+            math.log1p: numpy.log1p,
+            math.log2: numpy.log2,
+            math.radians: numpy.radians,
+            math.sin: numpy.sin,
+            math.sinh: numpy.sinh,
+            math.sqrt: numpy.sqrt,
+            math.tan: numpy.tan,
+            math.tanh: numpy.tanh,
+        }
+    )
+
+
 class Variable(Expression):
+    __slots__ = ("name",)
+
     _require_left = False
     op_func = staticmethod(_left)
 
@@ -378,8 +1374,8 @@ class Variable(Expression):
         if name is None:
             raise ValueError("variable must be identified with a name")
         self.name = name
-        if kwargs.get("reverse"):
-            self._require_left = True
+        if kwargs.get("reverse") and not args and "left" not in kwargs:
+            raise ValueError("missing required value to create an expression")
         super().__init__(*args, **kwargs)
         if self.right is not MISSING:
             raise ValueError("variable takes only the left value")
@@ -396,9 +1392,25 @@ class Variable(Expression):
 
     value.setter(set)
 
+    def eval(self, procedure: Literal[PRE, POST] = PRE, **params):
+        if (
+            self._result is not MISSING
+            or self.const
+            or procedure in (PREREVERSE, POSTREVERSE)
+            or self.is_reversed(procedure)
+        ):
+            return super().eval(procedure, **params)
+        self.parametrize(**params)
+        left = self.left
+        if isinstance(left, Expression):
+            return self._run(procedure, params)
+        return left
+
     def parametrize(self, **kwargs):
-        self.left = kwargs.get(self.name, self.left)
-        if self.left is MISSING:
+        value = kwargs.get(self.name, MISSING)
+        if value is not MISSING:
+            self.left = value
+        elif self.left is MISSING:
             raise ValueError(f"variable {self.name} was not set but requested usage")
 
     def __repr__(self):
@@ -417,68 +1429,104 @@ def variables(names):
 class Add(Expression):
     """Addition expression."""
 
-    op_func = staticmethod(operator.add)
-    iop_func = staticmethod(operator.iadd)
-    opreverse_func = staticmethod(operator.sub)
-    iopreverse_func = staticmethod(operator.isub)
+    __slots__ = ()
+
+    associative = True
+    identity = 0
+    op_func = operator.add
+    iop_func = operator.iadd
+    opreverse_func = operator.sub
+    iopreverse_func = operator.isub
 
 
 class Concatenate(Expression):
     """Concatenation expression."""
 
-    op_func = staticmethod(operator.concat)
-    iop_func = staticmethod(operator.iconcat)
+    __slots__ = ()
+
+    op_func = operator.concat
+    iop_func = operator.iconcat
     opreverse_func = staticmethod(strings.remove_suffix)
 
 
 class ConcatenateLeft(Expression):
     """Left concatenation expression."""
 
+    __slots__ = ()
+
     op_func = staticmethod(_concat_left)
     opreverse_func = staticmethod(strings.remove_prefix)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if type(self.right) in (bytes, str):
+            self._processor = _prepend
+
 
 class Subtract(Expression):
     """Subtraction expression."""
 
-    op_func = staticmethod(operator.sub)
-    iop_func = staticmethod(operator.isub)
-    opreverse_func = staticmethod(operator.add)
-    iopreverse_func = staticmethod(operator.iadd)
+    __slots__ = ()
+
+    op_func = operator.sub
+    iop_func = operator.isub
+    opreverse_func = operator.add
+    iopreverse_func = operator.iadd
+
+    @classmethod
+    def folded(cls, left: Any | Expression = MISSING, right: Any | Expression = MISSING, **kwargs):
+        """
+        Like Expression.folded(), but subtracting an integer is rewritten
+        as adding its negation, so that it can be regrouped with other additions.
+        """
+        if type(right) is int:
+            return Add.folded(left, -right, **kwargs)
+        return super().folded(left, right, **kwargs)
 
 
 class Multiply(Expression):
     """Multiplication expression."""
 
-    op_func = staticmethod(operator.mul)
-    iop_func = staticmethod(operator.imul)
-    opreverse_func = staticmethod(operator.truediv)
-    iopreverse_func = staticmethod(operator.itruediv)
+    __slots__ = ()
+
+    associative = True
+    identity = 1
+    op_func = operator.mul
+    iop_func = operator.imul
+    opreverse_func = operator.truediv
+    iopreverse_func = operator.itruediv
 
 
 class Divide(Expression):
     """Division expression."""
 
-    op_func = staticmethod(operator.truediv)
-    iop_func = staticmethod(operator.itruediv)
-    opreverse_func = staticmethod(operator.mul)
-    iopreverse_func = staticmethod(operator.imul)
+    __slots__ = ()
+
+    op_func = operator.truediv
+    iop_func = operator.itruediv
+    opreverse_func = operator.mul
+    iopreverse_func = operator.imul
 
 
 class FloorDivide(Expression):
     """Floor division expression."""
 
-    op_func = staticmethod(operator.floordiv)
-    iop_func = staticmethod(operator.ifloordiv)
-    opreverse_func = staticmethod(operator.mul)
-    iopreverse_func = staticmethod(operator.imul)
+    __slots__ = ()
+
+    op_func = operator.floordiv
+    iop_func = operator.ifloordiv
+    opreverse_func = operator.mul
+    iopreverse_func = operator.imul
 
 
 class Power(Expression):
     """Exponentiation expression."""
 
-    op_func = staticmethod(operator.pow)
-    iop_func = staticmethod(operator.pow)
+    __slots__ = ()
+
+    identity = 1
+    op_func = operator.pow
+    iop_func = operator.pow
     opreverse_func = staticmethod(_reverse_pow)
     iopreverse_func = staticmethod(_ireverse_pow)
 
@@ -486,63 +1534,83 @@ class Power(Expression):
 class Root(Expression):
     """Root expression."""
 
+    __slots__ = ()
+
     op_func = staticmethod(_reverse_pow)
     iop_func = staticmethod(_ireverse_pow)
-    opreverse_func = staticmethod(operator.pow)
-    iopreverse_func = staticmethod(operator.pow)
+    opreverse_func = operator.pow
+    iopreverse_func = operator.pow
 
 
 class Modulo(Expression):
     """Division and modulo expression."""
 
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(operator.mod)
-    iop_func = staticmethod(operator.imod)
+    op_func = operator.mod
+    iop_func = operator.imod
 
 
 class DivMod(Expression):
     """Division and modulo expression."""
 
-    op_func = staticmethod(divmod)
+    __slots__ = ()
+
+    op_func = divmod
     opreverse_func = staticmethod(_reverse_divmod)
 
 
 class MatrixMultiply(Expression):
     """Matrix multiplication (a @ b) expression."""
 
-    op_func = staticmethod(operator.rshift)
-    iop_func = staticmethod(operator.irshift)
+    __slots__ = ()
+
+    op_func = operator.matmul
+    iop_func = operator.imatmul
+    if numpy is not None:
+        opreverse_func = staticmethod(_reverse_matmul)
 
 
 class ShiftLeft(Expression):
     """Shift left (a << b) expression."""
 
-    op_func = staticmethod(operator.lshift)
-    iop_func = staticmethod(operator.ilshift)
-    opreverse_func = staticmethod(operator.rshift)
-    iopreverse_func = staticmethod(operator.irshift)
+    __slots__ = ()
+
+    op_func = operator.lshift
+    iop_func = operator.ilshift
+    opreverse_func = operator.rshift
+    iopreverse_func = operator.irshift
 
 
 class ShiftRight(Expression):
     """Shift right (a >> b) expression."""
 
-    op_func = staticmethod(operator.rshift)
-    iop_func = staticmethod(operator.irshift)
-    opreverse_func = staticmethod(operator.lshift)
-    iopreverse_func = staticmethod(operator.ilshift)
+    __slots__ = ()
+
+    op_func = operator.rshift
+    iop_func = operator.irshift
+    opreverse_func = operator.lshift
+    iopreverse_func = operator.ilshift
 
 
 class AND(Expression):
     """Bitwise AND (a & b) expression."""
 
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(operator.and_)
-    iop_func = staticmethod(operator.iand)
+    associative = True
+    identity = ~0
+    op_func = operator.and_
+    iop_func = operator.iand
 
 
 class NAND(Expression):
     """Bitwise NAND (~(a & b)) expression."""
 
+    __slots__ = ()
+
     irreversible = True
     op_func = staticmethod(_nand)
 
@@ -550,14 +1618,20 @@ class NAND(Expression):
 class OR(Expression):
     """Bitwise OR (a | b) expression."""
 
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(operator.or_)
-    iop_func = staticmethod(operator.ior)
+    associative = True
+    identity = 0
+    op_func = operator.or_
+    iop_func = operator.ior
 
 
 class NOR(Expression):
     """Bitwise NOR (~(a | b)) expression."""
 
+    __slots__ = ()
+
     irreversible = True
     op_func = staticmethod(_nor)
 
@@ -565,151 +1639,207 @@ class NOR(Expression):
 class XOR(Expression):
     """Bitwise XOR (a ^ b) expression."""
 
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(operator.xor)
-    iop_func = staticmethod(operator.ixor)
+    associative = True
+    identity = 0
+    op_func = operator.xor
+    iop_func = operator.ixor
 
 
 class EQU(Expression):
     """Bitwise EQU (~(a ^ b)) expression."""
 
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(lambda left, right: ~(left ^ right))
+    op_func = staticmethod(_equ)
 
 
 class And(Expression):
     """Logical AND (a and b) expression."""
 
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(lambda left, right: left and right)
+    op_func = staticmethod(_and)
 
 
 class NAnd(Expression):
     """Logical NAND (not (a and right)) expression."""
 
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(lambda left, right: (left, right)[(left and right) is left])
+    op_func = staticmethod(_logical_nand)
 
 
 class Or(Expression):
     """Logical OR (a or right) expression."""
 
-    op_func = staticmethod(lambda left, right: left or right)
+    __slots__ = ()
+
+    op_func = staticmethod(_or)
     irreversible = True
 
 
 class NOr(Expression):
     """Logical NOR (not (a or right)) expression."""
 
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(lambda left, right: (left, right)[(left or right) is left])
+    op_func = staticmethod(_logical_nor)
 
 
 class XOr(Expression):
     """Logical XOR (a ^ right) expression."""
 
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(lambda left, right: bool(left) ^ bool(right))
+    op_func = staticmethod(_logical_xor)
 
 
 class Equal(Expression):
     """Logical EQU (a == right) expression."""
 
-    op_func = staticmethod(lambda left, right: left == right)
+    __slots__ = ()
+
+    op_func = operator.eq
     irreversible = True
 
 
 class GetItem(Expression):
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(lambda left, right: left[right])
+    op_func = operator.getitem
 
 
 class GetAttr(Expression):
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(getattr)
+    pure = False  # attribute access may run arbitrary code
+    op_func = getattr
 
 
 class Is(Expression):
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(operator.is_)
+    op_func = operator.is_
 
 
 class IsNot(Expression):
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(operator.is_not)
+    op_func = operator.is_not
 
 
 class Contains(Expression):
+    __slots__ = ()
+
     irreversible = True
-    op_func = staticmethod(operator.contains)
+    op_func = operator.contains
 
 
 class Call(Expression):
-    irreversible = True
+    __slots__ = ()
 
-    def op_func(self, left, right):
-        if isinstance(right, ParameterHolder):
-            return left(*right.eval_arguments(left), **right.eval_keywords(left))
-        return left(right)
+    irreversible = True
+    pure = False
+    op_func = staticmethod(_call)
 
 
 class MathOps(OpsExtension):
+    __slots__ = ()
+
     class ATan2(Expression):
+        __slots__ = ()
+
         irreversible = True
-        op_func = staticmethod(math.atan2)
+        op_func = math.atan2
 
     class Comb(Expression):
+        __slots__ = ()
+
         irreversible = True
-        op_func = staticmethod(math.comb)
+        op_func = math.comb
 
     class CopySign(Expression):
+        __slots__ = ()
+
         irreversible = True
-        op_func = staticmethod(math.copysign)
+        op_func = math.copysign
 
     class Dist(Expression):
+        __slots__ = ()
+
         irreversible = True
-        op_func = staticmethod(math.dist)
+        op_func = math.dist
 
     class FMod(Expression):
+        __slots__ = ()
+
         irreversible = True
-        op_func = staticmethod(math.fmod)
+        op_func = math.fmod
 
     class GCD(Expression):
+        __slots__ = ()
+
         irreversible = True
-        op_func = staticmethod(math.gcd)
+        op_func = math.gcd
 
     class IsClose(Expression):
+        __slots__ = ("rel_tol", "abs_tol")
+
         def __init__(self, *args, **kwargs):
             self.rel_tol = kwargs.pop("rel_tol", 1e-09)
             self.abs_tol = kwargs.pop("abs_tol", 0.0)
             super().__init__(*args, **kwargs)
 
         irreversible = True
-        op_func = staticmethod(math.isclose)
+        op_func = math.isclose
 
     class LDExp(Expression):
-        op_func = staticmethod(math.ldexp)
-        opreverse_func = staticmethod(lambda left, right: left / (2**right))
+        __slots__ = ()
+
+        op_func = math.ldexp
+        opreverse_func = staticmethod(_reverse_ldexp)
 
     class Log(Expression):
+        __slots__ = ()
+
         irreversible = True
-        op_func = staticmethod(math.log)
+        op_func = math.log
 
     class Perm(Expression):
+        __slots__ = ()
+
         irreversible = True
-        op_func = staticmethod(math.perm)
+        op_func = math.perm
 
     class Pow(Expression):
+        __slots__ = ()
+
         irreversible = True
-        op_func = staticmethod(math.pow)
+        op_func = math.pow
 
     class Prod(Expression):
+        __slots__ = ()
+
         irreversible = True
-        op_func = staticmethod(math.prod)
+        op_func = staticmethod(_prod)
 
     class Remainder(Expression):
+        __slots__ = ()
+
         irreversible = True
-        op_func = staticmethod(math.remainder)
+        op_func = math.remainder
 
     def acos(self):
         return self.called_by(math.acos)
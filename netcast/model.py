@@ -3,8 +3,10 @@ from __future__ import annotations  # Python 3.8
 import collections.abc
 import contextlib
 import functools
-import inspect
-from typing import Any, cast, ClassVar, Type, TypeVar, Union
+import operator
+import sys
+import weakref
+from typing import Any, Callable, cast, ClassVar, Type, TypeVar, Union
 
 from netcast.constants import MISSING, GREATEST
 from netcast.driver import DriverMeta, Driver, load_driver
@@ -27,6 +29,11 @@ __all__ = (
 FIELD_NAME_ESCAPE = "f__"
 REPEATED_NAME_TEMPLATE = "%(name)s[%(size)d]"
 REPEATED_MEMBER_NAME_TEMPLATE = "%(name)s_%(index)d"
+SERIALIZER_CACHE_SIZE = 32
+
+_model_cache: weakref.WeakValueDictionary[tuple, type[Model]] = (
+    weakref.WeakValueDictionary()
+)
 
 
 def escape(field_name: str) -> str:
@@ -38,25 +45,27 @@ def unescape(field_name: str) -> str:
 
 
 class ModelProperty:
+    __slots__ = ()
     component: ComponentT
 
 
 class Field(ModelProperty):
+    __slots__ = ("component", "refers_to_model", "_key")
+
     def __init__(self, component: ComponentT):
         self.component = component
-        self.states = IDLookupDictionary()
-        self.models = IDLookupDictionary()
-
-    @functools.cached_property
-    def refers_to_model(self):
-        return isinstance(self.component, type) and issubclass(self.component, Model)
+        self.refers_to_model = isinstance(component, type) and issubclass(
+            component, Model
+        )
+        # Model instances keep the state (or the submodel) of this field in their __dict__
+        self._key = f"_field_{id(self):x}"
 
     def get_component(self, model: Model) -> Serializer | Model:
         if self.refers_to_model:
-            component = self.models.get(model)
+            namespace = vars(model)
+            component = namespace.get(self._key)
             if component is None:
-                component = self.component()
-                self.models[model] = component
+                component = namespace[self._key] = self.component()
         else:
             component = self.component
         return component
@@ -68,7 +77,7 @@ class Field(ModelProperty):
             if settings is None:
                 settings = {}
             return self.get_component(instance).get_state(empty, **settings)
-        state = self.states.setdefault(instance, empty)
+        state = vars(instance).setdefault(self._key, empty)
         return empty if state is MISSING else state
 
     def __get__(self, instance: Model | None, owner: type[Model] | None) -> Any:
@@ -76,7 +85,7 @@ class Field(ModelProperty):
             return self
         if self.refers_to_model:
             return self.get_component(instance)
-        return self.get_state(instance)
+        return vars(instance).get(self._key, MISSING)
 
     def __set__(self, instance: Model | None = None, state: Any = MISSING):
         if self.refers_to_model:
@@ -86,7 +95,7 @@ class Field(ModelProperty):
             else:
                 model.set_state(state)
         else:
-            self.states[instance] = state
+            vars(instance)[self._key] = state
 
     def __call__(self, state) -> Any:
         self.__set__(state=state)
@@ -97,8 +106,11 @@ class Field(ModelProperty):
 
 
 class FieldAlias(ModelProperty):
+    __slots__ = ("ancestor", "refers_to_model")
+
     def __init__(self, ancestor: Field):
         self.ancestor = ancestor
+        self.refers_to_model = ancestor.refers_to_model
 
     @property
     def component(self) -> ComponentT:
@@ -126,6 +138,11 @@ DriverArgT = Union[DriverMeta, Interface, str, type(None)]
 class Model:
     stack: ClassVar[Stack]
     settings: ClassVar[dict[str, Any]]
+    _descriptors: ClassVar[dict[str, Field]]
+    _fields: ClassVar[tuple[tuple[str, Field], ...]]  # items of _descriptors
+    _field_names: ClassVar[tuple[str, ...]]  # keys of _descriptors, in their order
+    _getters: ClassVar[dict[str, Callable[[Model, Any], Any]]]
+    _setters: ClassVar[dict[str, Callable[[Model, Any], None]]]
     name: str
     _field_class = Field
     _field_alias_class = FieldAlias
@@ -170,13 +187,7 @@ class Model:
         self.default_driver = default_driver
         self.propagate_driver = propagate_driver
         self.settings = {**self.settings, **settings}
-
-    def _choose_descriptors(self, settings: SettingsT) -> dict[Any, Field]:
-        namespace = set(self.choose_components(**settings))
-        descriptors = {
-            name: desc for name, desc in self._descriptors.items() if name in namespace
-        }
-        return descriptors
+        self._serializers = {}
 
     def _infer_states(self, settings: SettingsT):
         for key in settings.copy():
@@ -191,7 +202,7 @@ class Model:
     @property
     def default(self) -> Any:
         defaults = self._defaults.copy()
-        for name, descriptor in self._descriptors.items():
+        for name, descriptor in self._fields:
             model = descriptor.get_component(self)
             default = model.default
             if default is not MISSING:
@@ -209,10 +220,12 @@ class Model:
         return cls
 
     def get_state(self, empty=MISSING, /, **settings: Any) -> dict:
-        descriptors = self._choose_descriptors(settings)
+        components = self.choose_components(**settings)
         states = {}
 
-        for name, descriptor in descriptors.items():
+        for name, descriptor in self._fields:
+            if name not in components:
+                continue
             state = descriptor.get_state(self, empty, settings)
             if state is MISSING:
                 if empty is not MISSING:
@@ -227,7 +240,12 @@ class Model:
         return states
 
     def choose_components(self, **settings: Any) -> dict[Any, ComponentT]:
-        settings = {**settings, **self.settings}
+        # The stack only reads the settings, so there is no need to merge
+        # them into a new dict when one of the sides is empty
+        if not settings:
+            settings = self.settings
+        elif self.settings:
+            settings = {**settings, **self.settings}
         return self.stack.choose_components(settings)
 
     def with_(self, **values):
@@ -256,18 +274,40 @@ class Model:
 
         if isinstance(driver, DriverMeta):
             settings.update(name=self.name)
-            serializer = driver.lookup_model_serializer(self, **settings)
+            return self._lookup_serializer(driver, settings, final)
 
-        else:
-            serializer = driver
-            settings.update(name=self.name, default=self.default)
-            serializer = serializer.get_dep(serializer, **settings)
+        serializer = driver
+        settings.update(name=self.name, default=self.default)
+        serializer = serializer.get_dep(serializer, **settings)
 
         if final:
             return serializer.impl(driver, settings, final=final)
 
         return serializer
 
+    def _lookup_serializer(self, driver: DriverMeta, settings: SettingsT, final: bool):
+        """Look up the model serializer in the driver, reusing the recent lookups."""
+        stack = self.stack
+        revision = stack.revision
+        serializers = self._serializers
+        try:
+            key = (driver, final, frozenset(settings.items()))
+            cached = serializers.get(key)
+        except TypeError:  # unhashable settings
+            key = cached = None
+        if cached is not None and cached[0] is stack and cached[1] == revision:
+            return cached[2]
+
+        serializer = driver.lookup_model_serializer(self, **settings)
+        if final:
+            serializer = serializer.impl(driver, settings, final=final)
+
+        if key is not None:
+            if len(serializers) >= SERIALIZER_CACHE_SIZE and key not in serializers:
+                del serializers[next(iter(serializers))]
+            serializers[key] = stack, revision, serializer
+        return serializer
+
     def dump(self, driver: DriverArgT = None, /, **settings: Any) -> Any:
         serializer = self.impl(driver, settings)
         source = serializer.ensure_load_type(self.get_state(**settings))
@@ -297,18 +337,30 @@ class Model:
     def priority(cls):
         return cls.settings.setdefault("priority", 0)
 
-    @functools.singledispatchmethod
     def read_state(self, load: Any) -> dict | tuple[tuple[str, Any], ...]:
+        load_type = type(load)
+        if load_type is dict:
+            return dict(load)
+        if load_type is tuple or load_type is list:
+            return dict(zip(self._field_names, load))
+        return self._read_state(load)
+
+    @functools.singledispatchmethod
+    def _read_state(self, load: Any) -> dict | tuple[tuple[str, Any], ...]:
         raise TypeError(f"unsupported state type: {type(load).__name__}")
 
-    @read_state.register
+    @_read_state.register
     def read_sequence_state(self, load: collections.abc.Sequence) -> "dict[str, Any]":
-        return dict(zip(self._descriptors, load))
+        return dict(zip(self._field_names, load))
 
-    @read_state.register
+    @_read_state.register
     def read_mapping_state(self, load: collections.abc.Mapping) -> dict:
         return dict(load)
 
+    # Readers of other state types are registered with Model.read_state.register();
+    # plain dicts, tuples and lists are always read by the fast path above
+    read_state.register = _read_state.register
+
     def set_state(self, state: dict):
         if callable(getattr(state, "items", None)):
             state = state.items()
@@ -320,7 +372,7 @@ class Model:
         return self
 
     def clear(self):
-        return self.set_state(dict.fromkeys(self._descriptors, MISSING))
+        return self.set_state(dict.fromkeys(self._field_names, MISSING))
 
     @classmethod
     def clone(cls, name=None, settings=None):
@@ -333,24 +385,17 @@ class Model:
         return create_model(stack=cls.stack, name=name, **new_settings)
 
     def __iter__(self):
-        for name in self._descriptors:
-            yield name, self[name]
+        for name, descriptor in self._fields:
+            yield name, descriptor.__get__(self, None)
 
     def __setitem__(self, key: Any, value: Any):
-        self._descriptors[key].__set__(self, value)
+        self._setters[key](self, value)
 
     def __class_getitem__(cls, repeat):
         return repeated(cls, repeat, name=cls.name)
 
     def __getitem__(self, key: Any):
-        return self._descriptors[key].__get__(self, None)
-
-    def __setattr__(self, key: str, value: Any):
-        if key in self._descriptors:
-            self._descriptors[key].__set__(self, value)
-            return
-        # TODO: find a better way to do it
-        object.__setattr__(self, key, value)
+        return self._getters[key](self, None)
 
     def __eq__(self, other: Model):
         if not isinstance(other, Model):
@@ -377,9 +422,7 @@ class Model:
         descriptors = {}
         seen_descriptors = IDLookupDictionary()
 
-        for idx, (attribute, component) in enumerate(
-            inspect.getmembers(cls, check_component), start=1
-        ):
+        for idx, (attribute, component) in enumerate(_get_components(cls), start=1):
             seen = seen_descriptors.get(component)
             attribute_unescaped = unescape(attribute)
 
@@ -404,12 +447,13 @@ class Model:
             seen_descriptors[component] = field
 
         final.update(sorted(descriptors.items(), key=lambda kv: kv[1].priority))
+        cls._set_fields(final)
         descriptors.clear()
         seen_descriptors.clear()
 
     @classmethod
     def _load_stack(cls, stack, settings: SettingsT):
-        components = stack.choose_components(**settings)
+        components = stack.choose_components(settings)
         cls._descriptors = descriptors = collections.OrderedDict()
 
         for idx, (name, component) in enumerate(components.items(), start=1):
@@ -419,6 +463,20 @@ class Model:
                 name = escape(name)
             setattr(cls, name, descriptor)
 
+        cls._set_fields(descriptors)
+
+    @classmethod
+    def _set_fields(cls, descriptors: dict[str, Field]):
+        # Interned names make lookups of the (mostly interned) attribute
+        # names compare by identity
+        fields = tuple((sys.intern(name), field) for name, field in descriptors.items())
+        descriptors.clear()
+        descriptors.update(fields)
+        cls._fields = fields
+        cls._field_names = tuple(descriptors)
+        cls._getters = {name: field.__get__ for name, field in fields}
+        cls._setters = {name: field.__set__ for name, field in fields}
+
     @classmethod
     def _normalize_settings(cls, settings: SettingsT):
         normalized = {}
@@ -490,6 +548,30 @@ def check_component(obj: Any, acknowledge_type: bool = True) -> bool:
     return is_instance or is_type
 
 
+def _get_components(cls: type) -> list[tuple[str, ComponentArgT]]:
+    """
+    Return the components in the class namespace and its bases, sorted by name.
+
+    Like inspect.getmembers(cls, check_component), but reads the namespaces
+    directly instead of calling getattr() on every attribute of the class.
+    """
+    seen = set()
+    components = []
+    for klass in cls.__mro__:
+        if klass is Model or klass is object:  # never hold components
+            continue
+        for attribute, value in vars(klass).items():
+            if attribute in seen:
+                continue
+            seen.add(attribute)
+            if attribute[:2] == "__" and attribute[-2:] == "__":
+                continue
+            if check_component(value):
+                components.append((attribute, value))
+    components.sort(key=operator.itemgetter(0))
+    return components
+
+
 def create_model(
     *components: ComponentArgT,
     stack: Stack | None = None,
@@ -500,7 +582,30 @@ def create_model(
     serializer: type[Serializer] | None = None,
     **settings,
 ) -> Type[Model]:
+    """
+    Create a model class of the components.
+
+    Calls that create a new stack get the same class as an identical
+    earlier call, as long as that class is still alive.
+    """
+    key = None
     if stack is None:
+        try:
+            key = (
+                name,
+                components,
+                model_class,
+                model_metaclass,
+                stack_class,
+                serializer,
+                frozenset(settings.items()),
+            )
+            model = _model_cache.get(key)
+        except TypeError:  # unhashable components or settings
+            key = None
+        else:
+            if model is not None:
+                return model
         stack = stack_class()
     for component in components:
         stack.add(component, settings=settings)
@@ -515,6 +620,8 @@ def create_model(
         serializer=serializer,
         **settings,
     )
+    if key is not None:
+        _model_cache[key] = model
     return cast(Type[Model], model)
 
 
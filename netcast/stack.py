@@ -18,6 +18,9 @@ if typing.TYPE_CHECKING:
 
 __all__ = ("Stack", "SelectiveStack", "VersionAwareStack")
 
+# Settings that are applied as serializer attributes instead of being stored
+_ATTRIBUTE_SETTINGS = frozenset(("name", "default"))
+
 
 @functools.total_ordering
 class _PrioritySortWrapper:
@@ -32,6 +35,15 @@ class _PrioritySortWrapper:
 
 
 class Stack:
+    """
+    Components ordered in a heap by priority.
+
+    The heap is a tuple that writers replace as a whole, so that readers
+    can use it without locking. Writers are not serialized unless
+    :meth:`enable_locking` is called, as stacks are usually only modified
+    while their model class is being created.
+    """
+
     def __init__(
         self,
         name: str | None = None,
@@ -41,8 +53,9 @@ class Stack:
             name = f"{type(self).__name__.casefold()}_{id(self)}"
         self.name = name
         self.default_name_template = default_name_template
-        self._components = []
-        self._lock = threading.RLock()
+        self._components = ()
+        self._revision = 0
+        self._lock = None
 
     def add(
         self,
@@ -51,27 +64,35 @@ class Stack:
         settings: SettingsT = None,
         name: str | None = None,
     ):
-        """Push with transform."""
-        if isinstance(settings, dict):
-            settings = settings.copy()
+        """Push with transform. The settings are not modified."""
         transformed = self.transform_component(
             component=component, name=name, settings=settings
         )
         self.push(transformed)
         return transformed
 
-    def all(self):
-        return self._components.copy()
+    def all(self) -> list[ComponentT]:
+        """Return the components in heap order, like :meth:`get` and :meth:`pop` do."""
+        return [wrapper.component for wrapper in self._components]
+
+    def enable_locking(self):
+        """Serialize the modifications of this stack, if it is shared between threads."""
+        if self._lock is None:
+            self._lock = threading.Lock()
 
     def discard(self, component: ComponentT):
-        self._lock.acquire()
+        """Remove the component from the stack if it is there."""
+        lock = self._lock
+        if lock is not None:
+            lock.acquire()
         try:
-            idx = self._components.index(component)
-        except IndexError:
-            idx = None
-        self._lock.release()
-        if idx is not None:
-            self.pop(idx)
+            for idx, wrapper in enumerate(self._components):
+                if wrapper.component is component:
+                    self._pop(idx)
+                    break
+        finally:
+            if lock is not None:
+                lock.release()
 
     def default_name(self):
         fmt = {"name": self.name, "index": len(self._components) + 1}
@@ -85,48 +106,84 @@ class Stack:
         return name
 
     def push(self, component: ComponentT):
-        self._lock.acquire()
-        name = getattr(component, "name", None)
-        if name is None:
-            component.name = self.default_name()
-        heapq.heappush(self._components, _PrioritySortWrapper(component))
-        self._lock.release()
+        lock = self._lock
+        if lock is not None:
+            lock.acquire()
+        try:
+            name = getattr(component, "name", None)
+            if name is None:
+                component.name = self.default_name()
+            components = list(self._components)
+            heapq.heappush(components, _PrioritySortWrapper(component))
+            self._components = tuple(components)
+            self._revision += 1
+        finally:
+            if lock is not None:
+                lock.release()
 
     def pop(self, index: int | None = None) -> ComponentT | None:
-        self._lock.acquire()
+        """
+        Remove and return the component of the lowest priority or the one at the index.
+
+        The last component takes the place of the removed one and is sifted
+        into its heap position, so that the removal takes logarithmic time.
+        """
+        lock = self._lock
+        if lock is not None:
+            lock.acquire()
+        try:
+            return self._pop(index)
+        finally:
+            if lock is not None:
+                lock.release()
+
+    def _pop(self, index: int | None) -> ComponentT:
+        # The lock is not reentrant, so the callers take it
+        components = list(self._components)
         if index is None:
-            obj = heapq.heappop(self._components)
+            wrapper = heapq.heappop(components)
         else:
-            obj = self._components.pop(index)
-        self._lock.release()
-        return obj
+            index = range(len(components))[index]  # may raise an IndexError
+            wrapper = components[index]
+            last = components.pop()
+            if index < len(components):
+                components[index] = last
+                _sift(components, index)
+        self._components = tuple(components)
+        self._revision += 1
+        return wrapper.component
 
     def get(self, index: int = -1, settings: SettingsT = None) -> ComponentT | None:
-        self._lock.acquire()
         try:
-            obj = self._components[index].component
+            return self._components[index].component
         except IndexError:
-            obj = None
-        self._lock.release()
-        return obj
+            return None
 
     def clear(self):
-        self._lock.acquire()
-        self._components.clear()
-        self._lock.release()
+        lock = self._lock
+        if lock is not None:
+            lock.acquire()
+        try:
+            self._components = ()
+            self._revision += 1
+        finally:
+            if lock is not None:
+                lock.release()
 
     @property
     def size(self) -> int:
         return len(self._components)
 
+    @property
+    def revision(self) -> int:
+        """The number of changes made to this stack, to tell whether it changed."""
+        return self._revision
+
     def choose_components(self, settings: SettingsT = None) -> dict[str, ComponentT]:
-        if settings is None:
-            settings = {}
         suitable = {}
-        for idx in range(self.size):
-            component = self.get(idx, settings)
-            if component is not None:
-                suitable[component.name] = component
+        for wrapper in self._components:
+            component = wrapper.component
+            suitable[component.name] = component
         return suitable
 
     @classmethod
@@ -135,16 +192,30 @@ class Stack:
 
     @classmethod
     def transform_serializer(
-        cls, component: Serializer | Type, settings: SettingsT = None
+        cls,
+        component: Serializer | Type,
+        settings: SettingsT = None,
+        name: str | None = None,
     ) -> Serializer:
         if settings is None:
             settings = {}
+        elif "name" in settings:
+            name = None
         if isinstance(component, type) or getattr(component, "contained", False):
-            component = component(**settings)
+            if name is None:
+                component = component(**settings)
+            else:
+                component = component(name=name, **settings)
         component.contained = True
-        for key in settings.keys() & {"name", "default"}:
-            setattr(component, key, settings.pop(key))
-        component.settings.update(settings)
+        if name is not None:
+            component.name = name
+        for key in settings.keys() & _ATTRIBUTE_SETTINGS:
+            setattr(component, key, settings[key])
+        component.settings.update(
+            (key, value)
+            for key, value in settings.items()
+            if key not in _ATTRIBUTE_SETTINGS
+        )
         return component
 
     def transform_component(
@@ -156,22 +227,34 @@ class Stack:
     ) -> ComponentT | None:
         from netcast.model import Model
 
-        if settings is None:
-            settings = {}
-        if name:
-            settings.setdefault("name", name)
-        if isinstance(component, type) and not issubclass(component, Model):
-            component = self.transform_serializer(component, settings=settings)
-        elif isinstance(component, type) and issubclass(component, Model):
+        name = name or None
+        if isinstance(component, type) and issubclass(component, Model):
             component = self.transform_submodel(component)
         else:
-            component = self.transform_serializer(component, settings=settings)
+            component = self.transform_serializer(
+                component, settings=settings, name=name
+            )
         return component
 
-    def __del__(self):
-        for component in self._components:
-            component.contained = False
-        self.clear()
+    def release(self):
+        """
+        Remove all components and let other stacks use them without copying.
+
+        Components added to a stack are marked as contained, and adding them
+        to another stack adds a copy. Stacks of model classes normally live
+        as long as the process, so this is mostly needed in tests.
+        """
+        lock = self._lock
+        if lock is not None:
+            lock.acquire()
+        try:
+            for wrapper in self._components:
+                wrapper.component.contained = False
+            self._components = ()
+            self._revision += 1
+        finally:
+            if lock is not None:
+                lock.release()
 
     def __repr__(self) -> str:
         name = type(self).__name__
@@ -191,6 +274,17 @@ class SelectiveStack(Stack):
             component = None
         return component
 
+    def choose_components(self, settings: SettingsT = None) -> dict[str, ComponentT]:
+        if settings is None:
+            settings = {}
+        predicate = self.predicate
+        suitable = {}
+        for wrapper in self._components:
+            component = wrapper.component
+            if predicate(component, settings):
+                suitable[component.name] = component
+        return suitable
+
 
 class VersionAwareStack(SelectiveStack):
     """
@@ -218,27 +312,98 @@ class VersionAwareStack(SelectiveStack):
         self.default_version_added = default_version_added
         self.default_version_removed = default_version_removed
 
+    @property
+    def version_added_field(self) -> str | Callable:
+        return self._version_added_field
+
+    @version_added_field.setter
+    def version_added_field(self, field: str | Callable):
+        self._version_added_field = field
+        self._get_version_added = _field_getter(field)
+        self._unversioned = None, False
+
+    @property
+    def version_removed_field(self) -> str | Callable:
+        return self._version_removed_field
+
+    @version_removed_field.setter
+    def version_removed_field(self, field: str | Callable):
+        self._version_removed_field = field
+        self._get_version_removed = _field_getter(field)
+        self._unversioned = None, False
+
+    def is_unversioned(self) -> bool:
+        """Tell whether none of the components has a version range set."""
+        components = self._components
+        checked, unversioned = self._unversioned
+        if checked is not components:
+            get_version_added = self._get_version_added
+            get_version_removed = self._get_version_removed
+            unversioned = all(
+                get_version_added(wrapper.component) is None
+                and get_version_removed(wrapper.component) is None
+                for wrapper in components
+            )
+            self._unversioned = components, unversioned
+        return unversioned
+
     def predicate_version(self, component: ComponentT, settings: SettingsT):
         if settings is None:
             settings = {}
         version = settings.get(self.settings_version_field, self.default_version)
-        default_added = self.default_version_added
-        default_removed = self.default_version_removed
-        if callable(self.version_added_field):
-            version_added = self.version_added_field(component)
-        else:
-            version_added = getattr(component, self.version_added_field, None)
+        version_added = self._get_version_added(component)
         if version_added is None:
-            version_added = default_added
-        if callable(self.version_added_field):
-            version_removed = self.version_removed_field(component)
-        else:
-            version_removed = getattr(component, self.version_removed_field, None)
+            version_added = self.default_version_added
+        version_removed = self._get_version_removed(component)
         if version_removed is None:
-            version_removed = default_removed
+            version_removed = self.default_version_removed
         introduced = version_added <= version
         up_to_date = version_removed > version
         return introduced and up_to_date
 
     def predicate(self, component: ComponentT, settings: SettingsT):
         return self.predicate_version(component, settings)
+
+    def choose_components(self, settings: SettingsT = None) -> dict[str, ComponentT]:
+        # Without a version requested, unversioned components are all in
+        # as long as the default range contains the default version
+        if (
+            (not settings or self.settings_version_field not in settings)
+            and type(self).predicate is VersionAwareStack.predicate
+            and type(self).predicate_version is VersionAwareStack.predicate_version
+            and self.default_version_added <= self.default_version
+            and self.default_version_removed > self.default_version
+            and self.is_unversioned()
+        ):
+            return Stack.choose_components(self, settings)
+        return super().choose_components(settings)
+
+
+def _sift(heap: list, index: int):
+    """Move the item at the index of a heap up or down to its heap position."""
+    item = heap[index]
+    start = index
+    while index > 0:
+        parent = (index - 1) // 2
+        if not item < heap[parent]:
+            break
+        heap[index] = heap[parent]
+        index = parent
+    if index == start:
+        size = len(heap)
+        child = 2 * index + 1
+        while child < size:
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < item:
+                break
+            heap[index] = heap[child]
+            index = child
+            child = 2 * index + 1
+    heap[index] = item
+
+
+def _field_getter(field: str | Callable) -> Callable:
+    if callable(field):
+        return field
+    return lambda component: getattr(component, field, None)
@@ -36,9 +36,13 @@ def truncate(
     return string
 
 
-if sys.version_info[:2] >= (3, 10):
-    remove_prefix = str.removeprefix
-    remove_suffix = str.removesuffix
+if sys.version_info[:2] >= (3, 9):
+
+    def remove_prefix(string: str, prefix: str) -> str:
+        return type(string).removeprefix(string, prefix)  # bytes have it too
+
+    def remove_suffix(string: str, suffix: str) -> str:
+        return type(string).removesuffix(string, suffix)
 
 else:
 
@@ -48,7 +52,7 @@ else:
         return string[:]
 
     def remove_suffix(string: str, suffix: str) -> str:
-        if string.startswith(suffix):
+        if suffix and string.endswith(suffix):
             return string[: -len(suffix)]
         return string[:]
 
@@ -0,0 +1,48 @@
+import pytest
+
+import netcast as nc
+from netcast.drivers.construct import Driver
+
+
+class TestNumbers:
+    @pytest.mark.parametrize(
+        "settings, dumped, loaded",
+        [
+            ({"bit_size": 16}, b"\x01\x00", 1),
+            ({"bit_size": 16, "big_endian": True}, b"\x00\x01", 1),
+            ({"bit_size": 32, "signed": False}, b"\xff\xff\xff\xff", 0xFFFFFFFF),
+            ({"bit_size": 8}, b"\xfe", -2),
+        ],
+    )
+    def test_integer(self, settings, dumped, loaded):
+        serializer = Driver.Integer(name="foo", **settings)
+        assert serializer.dump(loaded) == dumped
+        assert serializer.load(dumped, None) == loaded
+        assert serializer.load(bytearray(dumped), None) == loaded
+        assert serializer.load(memoryview(dumped), None) == loaded
+
+    def test_float(self):
+        serializer = Driver.FloatingPoint(bit_size=64)
+        assert serializer.load(serializer.dump(1.5), None) == 1.5
+
+    def test_wrapped_integer(self):
+        serializer = Driver.Integer(bit_size=8, one_of=(1, 2))
+        assert serializer.load(b"\x01", None) == 1
+        with pytest.raises(nc.NetcastError):
+            serializer.load(b"\x03", None)
+
+    def test_truncated_input(self):
+        with pytest.raises(nc.NetcastError):
+            Driver.Integer(bit_size=32).load(b"\x00", None)
+
+
+@pytest.mark.parametrize("compiled", (False, True))
+def test_struct(compiled):
+    serializer = Driver.Struct(
+        Driver.Integer(name="foo", bit_size=16),
+        Driver.String(name="bar"),
+        compiled=compiled,
+    )
+    dumped = serializer.dump({"foo": 1, "bar": "baz"})
+    assert dumped == b"\x01\x00baz\x00"
+    assert serializer.load(dumped, None) == {"foo": 1, "bar": "baz"}
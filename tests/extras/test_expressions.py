@@ -0,0 +1,457 @@
+import operator
+import sys
+
+import pytest
+
+from netcast.extras import expressions as e
+
+
+class Matrix:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __matmul__(self, other):
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        columns = list(zip(*other.rows))
+        return Matrix(
+            [[sum(map(operator.mul, row, column)) for column in columns] for row in self.rows]
+        )
+
+    def __eq__(self, other):
+        return self.rows == other.rows
+
+
+@pytest.fixture
+def x():
+    return e.variable("x")
+
+
+def test_arithmetic(x):
+    expression = (x + 2) * 3
+    assert expression.eval(x=1) == 9
+    assert expression.eval(x=2) == 12
+
+
+def test_processors():
+    assert e.Add.op_func(1, 2) == 3
+    assert e.Add(1, 2).op_func(1, 2) == 3
+    assert e.NAND(1, 2).op_func(1, 2) == ~0
+
+
+def test_equal(x):
+    assert x.eq(1).eval(x=1) is True
+    assert x == x
+    assert len({x, x + 1}) == 2
+
+
+def test_matrix_multiply(x):
+    identity = Matrix([[1, 0], [0, 1]])
+    matrix = Matrix([[1, 2], [3, 4]])
+    assert isinstance(x @ identity, e.MatrixMultiply)
+    assert isinstance(identity @ x, e.MatrixMultiply)
+    assert (x @ identity).eval(x=matrix) == matrix
+    assert (matrix @ x).eval(x=matrix) == Matrix([[7, 10], [15, 22]])
+
+
+def test_concatenate(x):
+    assert x.concat(b"bar").eval(x=b"foo") == b"foobar"
+    assert x.concat_left(b"bar").eval(x=b"foo") == b"barfoo"
+    assert x.concat_left([1]).eval(x=[2]) == [1, 2]
+    with pytest.raises(TypeError):
+        x.concat_left(1).eval(x="foo")
+    x.conf(flags=e.PRE)
+    assert x.concat("bar").eval(e.POST, x="foobar") == "foo"
+    assert x.concat_left("bar").eval(e.POST, x="barfoo") == "foo"
+    assert x.concat(b"bar").eval(e.POST, x=b"foobar") == b"foo"
+    assert x.concat_left(b"bar").eval(e.POST, x=b"barfoo") == b"foo"
+
+
+def test_inplace(x):
+    expression = e.Add(x, [2], inplace=True)
+    operand = [1]
+    assert expression.eval(x=operand) is operand
+    assert operand == [1, 2]
+
+
+def test_math_prod(x):
+    assert x.math.prod().eval(x=[2, 3]) == 6
+    assert x.math.prod(2).eval(x=[2, 3]) == 12
+
+
+def test_const(x):
+    expression = e.Add(x, 1, const=True)
+    assert expression.eval(x=1) == 2
+    assert expression.eval(x=2) == 2
+    expression.conf(const=False)
+    assert expression.eval(x=2) == 3
+
+
+def test_deep_expression(x):
+    expression = x
+    for _ in range(5000):
+        expression = expression + 1
+    assert expression.eval(x=0) == 5000
+
+
+def test_shared_subexpression(x):
+    shared = x + 1
+    assert (shared * shared).eval(x=2) == 9
+    calls = []
+    shared = e.Call(calls.append, x)
+    assert e.Is(shared, shared).eval(x=1)
+    assert calls == [1, 1]
+    shared = e.Is(e.Call(calls.append, x), None)
+    assert e.Is(shared, shared).eval(x=2)
+    assert calls == [1, 1, 2, 2]
+
+    class Counter:
+        reads = 0
+
+        @property
+        def value(self):
+            self.reads += 1
+            return self.reads
+
+    counter = Counter()
+    shared = e.GetAttr(x, "value")
+    assert (shared + shared).eval(x=counter) == 3
+    assert counter.reads == 2
+    operand = [1]
+    shared = e.Add(x, [2], inplace=True)
+    (shared + shared).eval(x=operand)
+    assert operand == [1, 2, 2]
+
+
+def test_program_follows_changes(x):
+    y = e.variable("y")
+    expression = (x + 1) * 2
+    assert expression.eval(x=1) == 4
+    x.set(y * 3)
+    assert expression.eval(y=1) == 8
+    expression.right = 3
+    assert expression.eval(y=1) == 12
+
+
+def test_rebound_variable(x):
+    y = e.variable("y")
+    x.set(y + 1)
+    assert (x * 2).eval(x=5) == 10
+    calls = []
+    x.set(e.Call(calls.append, 1))
+    expression = e.Is(x, None)
+    assert expression.eval()
+    x.set(5)
+    assert not expression.eval()
+    assert calls == [1]
+
+
+def test_const_shared_between_trees(x):
+    shared = e.Add(x, 1, const=True)
+    first, second = shared * 2, shared * 3
+    assert second.eval(x=0) == 3
+    assert first.eval(x=1) == 2
+    assert second.eval(x=5) == 3
+
+
+def test_method_processor(x):
+    class Offset(e.Expression):
+        irreversible = True
+        offset = 10
+
+        def op_func(self, left, right):
+            return left + right + self.offset
+
+    x.conf(flags=e.PRE)
+    assert Offset(1, 2).eval() == 13
+    assert Offset(x, 2).eval(x=1) == 13
+    assert Offset(x, 2, inplace=True).eval(x=1) == 13
+    assert Offset(x, 2).eval(e.POST, x=1) == 1
+
+
+def test_flags(x):
+    x.conf(flags=e.PRE)
+    expression = e.Add(x, 1, flags=e.PREREVERSE | e.POST)
+    assert expression.eval(x=3) == 2
+    assert expression.eval(e.POST, x=3) == 4
+    assert expression.conf(flags=e.PRE).eval(x=3) == 4
+    with pytest.raises(ValueError):
+        expression.flags = e.PRE | e.PREREVERSE
+    program = expression._get_program(e.PRE)
+    expression.conf(flags=e.PRE)
+    assert expression._get_program(e.PRE) is program
+
+
+def test_program_invalidation(x):
+    x.conf(flags=e.PRE)
+    inner = x + 1
+    expression = (inner * 2).compile()
+    unrelated = (x - 1).compile()
+    program, unrelated_program = expression._get_program(e.PRE), unrelated._get_program(e.PRE)
+    inner.flags = e.PREREVERSE
+    assert expression._get_program(e.PRE) is not program
+    assert unrelated._get_program(e.PRE) is unrelated_program
+    assert expression.eval(x=1) == 0
+    e.Add(2, 3, flags=e.PRE, const=True).eval()
+    assert unrelated._get_program(e.PRE) is unrelated_program
+
+
+def test_matrix_multiply_reverse(x):
+    numpy = pytest.importorskip("numpy")
+    x.conf(flags=e.PRE)
+    matrix = numpy.array([[1.0, 2.0], [3.0, 4.0]])
+    expression = e.MatrixMultiply(x, matrix)
+    dumped = expression.eval(x=numpy.eye(2))
+    assert numpy.allclose(expression.eval(e.POST, x=dumped), numpy.eye(2))
+
+
+def test_variable(x):
+    with pytest.raises(ValueError):
+        x.eval()
+    assert x.eval(x=1) == 1
+    assert x.eval() == 1
+    x.clear()
+    with pytest.raises(ValueError):
+        (x + 1).eval()
+
+
+def test_batch_eval(x):
+    numpy = pytest.importorskip("numpy")
+    values = numpy.arange(4)
+    assert (((x + 1) * 2).batch_eval(x=values) == (values + 1) * 2).all()
+    assert list(e.Call(str, x).batch_eval(x=values)) == ["0", "1", "2", "3"]
+    assert numpy.allclose(x.math.sin().batch_eval(x=values), numpy.sin(values))
+    assert list((-x).batch_eval(x=values)) == [0, -1, -2, -3]
+    floored = x.math.floor().batch_eval(x=values / 2)
+    assert list(floored) == [0, 0, 1, 1] and all(type(value) is int for value in floored)
+
+
+def test_compile(x):
+    x.conf(flags=e.PRE)
+    inner = x + 1
+    expression = (inner * 2).compile()
+    assert expression.eval(x=1) == 4
+    inner.flags = e.PREREVERSE
+    assert expression.eval(x=1) == 0
+
+
+def test_folded(x):
+    assert e.Add.folded(2, e.Multiply(3, 4, flags=e.PRE), flags=e.PRE) == 14
+    assert isinstance(e.Add.folded(2, 3), e.Add)
+    assert isinstance(e.Add.folded(x, 3, flags=e.PRE), e.Add)
+    expression = e.Multiply(x, e.Add.folded(2, 3, flags=e.PRE), flags=e.PRE)
+    assert expression.right == 5
+
+
+def test_folded_regrouping(x):
+    x.conf(flags=e.PRE)
+    expression = e.Add.folded(e.Add.folded(x, 2, flags=e.PRE), 3, flags=e.PRE)
+    assert expression.left is x and expression.right == 5
+    assert expression.eval(x=1) == 6
+    expression = e.Multiply.folded(e.Multiply(x, 3), 7)
+    assert isinstance(expression.left, e.Multiply)
+    assert expression.eval(e.POST, x=5) == 5 / 7 / 3
+    assert isinstance(e.Add.folded(x + 0.5, 0.25).left, e.Add)
+    assert isinstance(e.Add.folded(x + 2, 3, flags=e.PRE).left, e.Add)
+    assert isinstance(e.Multiply.folded(x - 2, 3).left, e.Subtract)
+    expression = e.Add.folded(e.Subtract.folded(x, 2, flags=e.PRE), 5, flags=e.PRE)
+    assert expression.left is x and expression.right == 3
+    assert expression.eval(x=1) == 4
+    assert isinstance(e.Subtract.folded(x, 0.5), e.Subtract)
+
+
+def test_batch_eval_inplace(x):
+    numpy = pytest.importorskip("numpy")
+    values = numpy.arange(4)
+    result = e.Add(x, 1, inplace=True).batch_eval(x=values)
+    assert result is values
+    assert list(values) == [1, 2, 3, 4]
+
+
+def test_batch_eval_fused(x):
+    numpy = pytest.importorskip("numpy")
+    pytest.importorskip("numexpr")
+    x.conf(flags=e.PRE)
+    values = numpy.arange(4.0)
+    expression = (x + 1) * (x + 1) - x / 2
+    assert numpy.allclose(expression.batch_eval(x=values), (values + 1) ** 2 - values / 2)
+    expression.right = 1
+    assert numpy.allclose(expression.batch_eval(x=values), (values + 1) ** 2 - 1)
+    power = e.Power(-2, x, flags=e.PRE)
+    assert list(power.batch_eval(x=numpy.array([2, 3]))) == [4, -8]
+    small = numpy.array([100, 1], dtype=numpy.int8)
+    assert ((x + 100) * 1).batch_eval(x=small).dtype == numpy.int8
+
+
+def test_batch_eval_without_numpy(x, monkeypatch):
+    monkeypatch.setattr(e, "numpy", None)
+    with pytest.raises(ImportError):
+        (x + 1).batch_eval(x=1)
+
+
+def test_jit(x):
+    pytest.importorskip("numba")
+    x.conf(flags=e.PRE)
+    function = ((x + 1) * 2 - x / 4).jit()
+    assert function(2.0) == 5.5
+    with pytest.raises(ValueError):
+        e.Call(abs, x).jit()
+
+
+def test_jit_without_numba(x, monkeypatch):
+    monkeypatch.setitem(sys.modules, "numba", None)
+    x.conf(flags=e.PRE)
+    with pytest.raises(ImportError):
+        (x + 1).jit()
+
+
+def test_to_function(x):
+    x.conf(flags=e.PRE)
+    y = e.variable("y").conf(flags=e.PRE)
+    expression = e.Or(e.And(x, (x + 1) * y), -1)
+    function = expression.to_function()
+    assert function(x=0, y=2) == -1
+    assert function(x=2, y=2) == expression.eval(x=2, y=2) == 6
+    assert expression.to_function() is function
+    with pytest.raises(ValueError):
+        e.Call(abs, x).to_function()
+    with pytest.raises(ValueError):
+        e.variable("if").conf(flags=e.PRE).to_function()
+    power = e.Power(-2, x, flags=e.PRE)
+    assert power.to_function()(2) == power.eval(x=2) == 4
+    assert e.Power(-0.5, x, flags=e.PRE).to_function()(2) == 0.25
+
+
+def test_interned(x):
+    assert e.Add.interned(x, 1) is e.Add.interned(x, 1)
+    assert e.Add.interned(x, 1) is not e.Add.interned(x, 1.0)
+    assert e.Add.interned(x, 1) is not e.Add.interned(x, 1, flags=e.PRE)
+    assert e.Add.interned(x, [1]) is not e.Add.interned(x, [1])
+    assert e.Add.interned(x, [1], inplace=True) is not e.Add.interned(x, [1], inplace=True)
+    assert e.Call.interned(print, 1) is not e.Call.interned(print, 1)
+    assert e.GetAttr.interned(x, "real") is not e.GetAttr.interned(x, "real")
+    expression = e.Is(e.GetAttr(x, "real"), e.GetAttr(x, "real")).canonicalize()
+    assert expression.left is not expression.right
+    expression = e.Multiply(e.Add.interned(x, 1), e.Add.interned(x, 1))
+    assert expression.eval(x=2) == 9
+
+
+def test_canonicalize(x):
+    x.conf(flags=e.PRE)
+    expression = e.Is(e.Add(x, 1), e.Add(x, 1)).canonicalize()
+    assert expression.left is expression.right
+    assert expression.eval(x=1)
+    calls = []
+    first, second = e.Call(calls.append, x), e.Call(calls.append, x)
+    expression = e.Is(first, second).canonicalize()
+    assert expression.left is first and expression.right is second
+    assert expression.eval(x=1)
+    assert calls == [1, 1]
+    expression = e.Add(e.Add(x, 1), e.Add(x, 1.0)).canonicalize()
+    assert expression.left is not expression.right
+
+
+def test_simplify(x):
+    x.conf(flags=e.PRE)
+    expression = e.Multiply(e.Add(0, 5, flags=e.PRE), x, flags=e.PRE).simplify()
+    assert expression.left == 5
+    assert e.Power(3, 1, flags=e.PRE).simplify() == 3
+    assert e.XOR(3, 0).simplify() == 3
+    assert e.Multiply(1, 1.5, flags=e.PRE).simplify() == 1.5
+    assert isinstance(e.Power(1.5, 1, flags=e.PRE).simplify(), e.Power)
+    assert isinstance(e.Add(x, 0, flags=e.PRE).simplify(), e.Add)
+    assert isinstance(e.Add(3, 0).simplify(), e.Add)
+    assert isinstance(e.Add(x, 0.0, flags=e.PRE).simplify(), e.Add)
+    assert isinstance(e.Power(1, x, flags=e.PRE).simplify(), e.Power)
+    assert isinstance(e.Add(x, 0, flags=e.PRE, const=True).simplify(), e.Add)
+
+
+def test_simplify_keeps_converted_operands():
+    for expression in (
+        e.Add(True, 0, flags=e.PRE),
+        e.OR(True, 0, flags=e.PRE),
+        e.XOR(True, 0, flags=e.PRE),
+        e.AND(True, ~0, flags=e.PRE),
+    ):
+        assert expression.simplify() is expression
+        assert expression.eval() == 1 and expression.eval() is not True
+    expression = e.Add("a", 0, flags=e.PRE)
+    assert expression.simplify() is expression
+    with pytest.raises(TypeError):
+        expression.eval()
+
+
+def test_eval_cached(x):
+    calls = []
+
+    class Counted(e.Expression):
+        irreversible = True
+
+        def op_func(self, left, right):
+            calls.append(left)
+            return left + right
+
+    expression = Counted(x, 0) + e.Add(x, 1)
+    assert expression.eval_cached(x=1) == 3
+    assert expression.eval_cached(x=1) == 3
+    assert calls == [1]
+    assert expression.eval_cached(x=2) == 5
+    assert x.eval() == 2
+    assert expression.eval_cached(x=1) == 3
+    assert x.eval() == 1
+    assert calls == [1, 2]
+    expression.clear_cache()
+    assert expression.eval_cached(x=1) == 3
+    assert expression.eval_cached() == 3
+    assert calls == [1, 2, 1, 1]
+    assert type(expression.eval_cached(x=1.0)) is float
+    assert calls[-1] == 1.0
+    unhashable = Counted(x, [0])
+    unhashable.eval_cached(x=[1])
+    unhashable.eval_cached(x=[1])
+    assert calls[-2:] == [[1], [1]]
+    impure = e.Call(calls.append, x).is_(None)
+    assert impure.eval_cached(x=5)
+    assert impure.eval_cached(x=5)
+    assert calls[-2:] == [5, 5]
+    expression.right = 0
+    assert expression.eval_cached(x=1) == 1
+
+
+def test_fold(x):
+    x.conf(flags=e.PRE)
+    constant = e.Multiply(e.Add(1, 2, flags=e.PRE), 4, flags=e.PRE)
+    expression = e.Add(x, constant, flags=e.PRE).fold()
+    assert expression.right == 12
+    assert expression.eval(x=1) == 13
+    assert e.Add(1, 2, flags=e.PRE).fold() == 3
+    assert isinstance(e.Add(1, 2).fold(), e.Add)
+    assert isinstance(e.Divide(1, 0, flags=e.PRE).fold(), e.Divide)
+    calls = []
+    assert isinstance(e.Call(calls.append, 1, flags=e.PRE).fold(), e.Call)
+    assert calls == []
+    memoized = e.Add(x, 1, const=True)
+    memoized.eval(x=1)
+    assert e.Multiply(memoized, x, flags=e.PRE).fold().left == 2
+
+
+def test_short_circuit(x):
+    x.conf(flags=e.PRE)
+    calls = []
+    expression = e.Or(e.And(x, e.Call(calls.append, x)), e.Call(calls.append, x))
+    assert expression.eval(x=0) is None
+    assert calls == [0]
+    assert expression.eval(x=1) is None
+    assert calls == [0, 1, 1]
+    shared = x + 1
+    expression = e.Add(e.And(x, shared), shared)
+    assert expression.eval(x=0) == 1
+    assert expression.eval(x=2) == 6
+
+
+def test_discarded_operand(x):
+    x.conf(flags=e.PRE)
+    calls = []
+    expression = e.Modulo(x, e.Call(calls.append, x))
+    assert expression.eval(e.POST, x=5) == 5
+    assert calls == []
@@ -1,4 +1,11 @@
+import gc
+import weakref
+
+import pytest
+
 import netcast as nc
+from netcast.constants import MISSING
+from netcast.stack import VersionAwareStack
 
 
 class TestModel:
@@ -27,6 +34,61 @@ class TestModel:
         assert Bar.settings == my_settings
         assert Bar().settings == my_settings
 
+    def test_mixin_components(self):
+        class Mixin:
+            b = nc.String()
+
+        class Foo(nc.Model, Mixin):
+            a = nc.Integer()
+            c = nc.Integer
+
+        assert Foo._field_names == ("a", "b", "c")
+        assert isinstance(Foo.b, nc.Field)
+        assert Foo(a=1, b="x", c=2).state == {"a": 1, "b": "x", "c": 2}
+
+    def test_inherited_stack(self):
+        class Foo(nc.Model):
+            a = nc.Integer()
+            b = nc.Integer()
+
+        class Bar(Foo):
+            c = nc.Integer()
+
+        class Baz(Foo, include=("a",)):
+            c = nc.Integer()
+
+        assert set(Bar.stack.choose_components()) == {"a", "b", "c"}
+        assert set(Baz.stack.choose_components()) == {"a", "c"}
+
+    def test_stack_settings(self):
+        stack = VersionAwareStack()
+        stack.add(nc.Integer(version_added=2), name="new")
+        stack.add(nc.Integer, name="old")
+
+        class Foo(nc.Model, stack=stack, version=1):
+            pass
+
+        assert Foo._field_names == ("old",)
+        assert Foo(old=1).get_state() == {"old": 1}
+
+    def test_read_state_register(self):
+        class Point:
+            def __init__(self, x, y):
+                self.x, self.y = x, y
+
+        class Foo(nc.Model):
+            x = nc.Integer()
+            y = nc.Integer()
+
+        @Foo.read_state.register
+        def read_point_state(self, load: Point) -> dict:
+            return {"x": load.x, "y": load.y}
+
+        assert Foo().load_state(Point(1, 2)).get_state() == {"x": 1, "y": 2}
+        assert Foo().load_state((3, 4)).get_state() == {"x": 3, "y": 4}
+        with pytest.raises(TypeError):
+            Foo().read_state(object())
+
     def test_functional_creation(self):
         model_name = "Foo"
         foo_model = nc.create_model(nc.Integer, name=model_name)
@@ -44,3 +106,62 @@ class TestModel:
         assert isinstance(bar_model.foo, nc.Field)
         assert bar_model.foo.contained
         assert bar_model.stack.size == 1
+
+    def test_functional_creation_cache(self):
+        foo_model = nc.create_model(nc.Integer, nc.String, name="Foo", version=1)
+        assert nc.create_model(nc.Integer, nc.String, name="Foo", version=1) is foo_model
+        assert nc.create_model(nc.Integer, nc.String, name="Foo") is not foo_model
+        assert nc.create_model(nc.Integer, name="Foo", version=1) is not foo_model
+        assert nc.create_model(nc.Integer, name="Foo", tags=[]) is not (
+            nc.create_model(nc.Integer, name="Foo", tags=[])
+        )
+        assert foo_model.clone() is not foo_model
+
+        ref = weakref.ref(foo_model)
+        del foo_model
+        gc.collect()
+        assert ref() is None
+
+    def test_instance_states(self):
+        class Inner(nc.Model):
+            a = nc.Integer()
+
+        class Foo(nc.Model):
+            x = nc.Integer()
+            inner = Inner
+
+        first, second = Foo(x=1), Foo(x=2)
+        first.inner.a = 3
+        assert first["x"] == 1 and second["x"] == 2
+        assert first.inner is not second.inner
+        assert second.inner["a"] is MISSING
+
+        reference = weakref.ref(first)
+        del first
+        gc.collect()
+        assert reference() is None
+
+    def test_serializer_cache(self):
+        lookups = []
+
+        class CountingDriver(nc.Driver, driver_name="test_serializer_cache"):
+            @classmethod
+            def lookup_model_serializer(cls, model, **settings):
+                lookups.append(settings)
+                return object()
+
+        class Foo(nc.Model):
+            x = nc.Integer()
+
+        foo = Foo(x=1)
+        serializer = foo.impl(CountingDriver)
+        assert foo.impl(CountingDriver) is serializer
+        assert foo.impl("test_serializer_cache") is serializer
+        assert len(lookups) == 1
+        assert foo.impl(CountingDriver, {"version": 1}) is not serializer
+        assert foo.impl(CountingDriver, {"unhashable": []}) is not None
+        assert foo.impl(CountingDriver, {"unhashable": []}) is not None
+        assert len(lookups) == 4
+        assert Foo(x=2).impl(CountingDriver) is not serializer
+        Foo.stack.add(nc.String, name="y")
+        assert foo.impl(CountingDriver) is not serializer
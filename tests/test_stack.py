@@ -47,10 +47,77 @@ class TestStack:
         with pytest.raises(IndexError):
             stack.pop()
 
+    def test_pop_index(self, stack, serializer_class):
+        priorities = random.sample(range(20), 20)
+        for priority in priorities:
+            stack.push(serializer_class(priority=priority))
+        removed = stack.pop(5).priority
+        assert stack.pop(-1)
+        assert stack.size == 18
+        popped = [stack.pop().priority for _ in range(stack.size)]
+        assert popped == sorted(popped)
+        assert removed not in popped
+
     def test_add(self, stack, serializer_class):
         stack.add(serializer_class)
         assert stack.pop() is not serializer_class
 
+    def test_add_settings(self, stack, serializer_class):
+        settings = {"default": 0, "big_endian": True}
+        stack.add(serializer_class, settings=settings, name="foo")
+        component = stack.pop()
+        assert settings == {"default": 0, "big_endian": True}
+        assert component.name == "foo"
+        assert component.default == 0
+        assert component.settings["big_endian"] is True
+        assert "default" not in component.settings
+        stack.add(serializer_class, settings={"name": "bar"}, name="foo")
+        assert stack.pop().name == "bar"
+
+    def test_discard(self, stack, serializer_class):
+        first, second = serializer_class(), serializer_class()
+        stack.push(first)
+        stack.push(second)
+        stack.discard(first)
+        assert stack.all() == [second]
+        stack.discard(first)
+        assert stack.size == 1
+        stack.enable_locking()
+        stack.discard(second)
+        assert stack.size == 0
+
+    def test_enable_locking(self, stack, serializer):
+        stack.enable_locking()
+        lock = stack._lock
+        assert lock is not None
+        stack.enable_locking()
+        assert stack._lock is lock
+        stack.push(serializer)
+        assert stack.pop() is serializer
+        assert lock.acquire(blocking=False)
+        lock.release()
+
+    def test_release(self, stack, serializer):
+        stack.add(serializer)
+        assert serializer.contained
+        assert stack.add(serializer) is not serializer
+        stack.release()
+        assert stack.size == 0
+        assert not serializer.contained
+        assert stack.add(serializer) is serializer
+
+    def test_revision(self, stack, serializer):
+        revisions = [stack.revision]
+        stack.push(serializer)
+        revisions.append(stack.revision)
+        stack.discard(serializer)
+        revisions.append(stack.revision)
+        stack.discard(serializer)
+        assert stack.revision == revisions[-1]
+        stack.clear()
+        revisions.append(stack.revision)
+        assert len(set(revisions)) == len(revisions)
+
     def test_transform(self, stack, serializer_class):
         component = stack.transform_component(serializer_class)
         assert component is not serializer_class
@@ -90,7 +157,49 @@ class TestVersionAwareStack:
 
         assert stack.predicate(component, settings=settings)
         assert stack.get(settings=settings) is not None
+        assert stack.choose_components(settings) == {component.name: component}
 
         settings[stack.settings_version_field] = incompatible_version
         assert not stack.predicate(component, settings=settings)
         assert stack.get(settings=settings) is None
+        assert stack.choose_components(settings) == {}
+
+    def test_fields(self, serializer_class):
+        stack = VersionAwareStack(
+            version_added_field="added",
+            version_removed_field=lambda component: component.settings.get("removed"),
+        )
+        component = serializer_class(removed=2)
+        component.added = 1
+        assert stack.predicate(component, {"version": 1})
+        assert not stack.predicate(component, {"version": 0})
+        assert not stack.predicate(component, {"version": 2})
+
+    def test_unversioned(self, serializer_class):
+        stack = VersionAwareStack()
+        first = stack.add(serializer_class, name="first")
+        assert stack.is_unversioned()
+        assert stack.choose_components() == {"first": first}
+        stack.default_version = 1
+        stack.default_version_removed = 1
+        assert stack.choose_components() == {}
+        stack.default_version_removed = 2
+        second = stack.add(serializer_class(version_removed=1), name="second")
+        assert not stack.is_unversioned()
+        assert stack.choose_components() == {"first": first}
+        stack.discard(second)
+        assert stack.is_unversioned()
+        stack.version_removed_field = lambda component: 0
+        assert not stack.is_unversioned()
+        assert stack.choose_components() == {}
+
+    def test_unversioned_override(self, serializer_class):
+        class OddStack(VersionAwareStack):
+            def predicate_version(self, component, settings):
+                return component.name.endswith("odd")
+
+        stack = OddStack()
+        stack.add(serializer_class, name="odd")
+        stack.add(serializer_class, name="even")
+        assert stack.is_unversioned()
+        assert list(stack.choose_components()) == ["odd"]